@@ -1,15 +1,24 @@
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Depends, File, Header, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import Any, List, Optional, Union
+from datetime import datetime
 
 from database.models import models
 from business.validation import schemas
-from database.repository import crud
-from database.config.database import SessionLocal, engine
+from database.repository import crud, search_index
+from database.repository.runner import run_db
+from database.config.database import DB_ASYNC, AsyncSessionLocal, SessionLocal, async_engine, engine
+from business.services import bulk, cache, events, export, importer, pagination, projection, serialization
+from business.services.compression import CompressionMiddleware
+from business.services.etag import ETagMiddleware
 
-# Créer les tables
+# Créer les tables, leurs index et l'index de recherche plein texte
 models.Base.metadata.create_all(bind=engine)
+models.create_missing_indexes(engine)
+if search_index.setup_search_index(engine) and async_engine is not None:
+    search_index.mark_enabled(async_engine.sync_engine)
 
 app = FastAPI(
     title="API CRUD FastAPI",
@@ -17,74 +26,259 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Dépendance pour obtenir la session de base de données
-def get_db():
+# ETag sur les réponses GET JSON, 304 si If-None-Match correspond
+app.add_middleware(ETagMiddleware)
+# Compression gzip/brotli : ajoutée après, elle enveloppe ETagMiddleware
+# (l'ETag est calculé sur le corps non compressé)
+app.add_middleware(CompressionMiddleware)
+
+# Dépendances pour obtenir la session de base de données
+def get_sync_db():
+    """Session synchrone, pour les traitements par lots exécutés dans le pool de threads"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+if DB_ASYNC:
+    async def get_db():
+        """Session asynchrone (DB_ASYNC activé) pour les endpoints CRUD"""
+        async with AsyncSessionLocal() as db:
+            yield db
+else:
+    get_db = get_sync_db
+
+def decode_cursor(cursor: str) -> int:
+    """Décode un curseur de pagination ou renvoie une erreur 400"""
+    try:
+        return pagination.decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_fields(parser, fields: Optional[str]):
+    """Analyse le paramètre `fields` ou renvoie une erreur 400"""
+    try:
+        return parser(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def read_items_page(db, skip: int, limit: int, cursor: Optional[str], fields: Optional[str],
+                          filters: schemas.ItemFilters, sort: str = "id"):
+    """
+    Page d'articles filtrée et triée, sérialisée à partir des lignes
+    
+    Sans `cursor` : liste (skip/limit). Avec `cursor` : {"items", "next_cursor"},
+    le curseur portant la valeur de la colonne de tri si ce n'est pas l'ID.
+    """
+    item_fields = parse_fields(projection.parse_item_fields, fields)
+    _, list_adapter, page_adapter = projection.adapters(projection.item_schema(item_fields))
+    try:
+        sort_key, _ = crud.parse_item_sort(sort)
+        if cursor is None:
+            items = await run_db(db, crud.get_item_rows, skip=skip, limit=limit,
+                                 fields=item_fields, filters=filters, sort=sort)
+            return serialization.json_response(list_adapter, items)
+        if cursor == "":
+            after_id, after_key = None, None
+        elif sort_key == "id":
+            after_id, after_key = pagination.decode_cursor(cursor), None
+        else:
+            after_id, after_key = pagination.decode_sorted_cursor(cursor)
+        items = await run_db(db, crud.get_item_rows, limit=limit + 1, after_id=after_id, after_key=after_key,
+                             fields=item_fields, filters=filters, sort=sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_cursor = pagination.next_cursor(items, limit, None if sort_key == "id" else sort_key)
+    return serialization.json_response(page_adapter, {"items": items, "next_cursor": next_cursor})
+
+async def read_change_feed(db, table_name: str, row_schema, since: str, limit: int):
+    """Page du journal des changements d'une table à partir du curseur `since`"""
+    after_id = decode_cursor(since)
+    rows = await run_db(db, crud.get_changes, table_name=table_name, after_id=after_id, limit=limit + 1)
+    has_more = len(rows) > limit
+    del rows[limit:]
+    changes = [
+        schemas.Change(
+            id=change.id,
+            operation=change.operation,
+            row_id=change.row_id,
+            changed_at=change.changed_at,
+            data=row_schema.model_validate(row) if row is not None else None,
+        )
+        for change, row in rows
+    ]
+    # Sans changement, le curseur reste le même : le client le renverra au prochain appel
+    next_id = rows[-1][0].id if rows else after_id
+    return schemas.ChangesPage(changes=changes, next_cursor=pagination.encode_cursor(next_id), has_more=has_more)
+
 @app.get("/")
 def read_root():
     return {"message": "Bienvenue dans l'API CRUD FastAPI!", "docs": "/docs"}
 
 # Endpoints pour les utilisateurs
 @app.post("/users/", response_model=schemas.User, tags=["Users"])
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     """Créer un nouvel utilisateur"""
-    db_user = crud.get_user_by_email(db, email=user.email)
-    if db_user:
+    # L'unicité de l'email est garantie par l'index unique lors de l'INSERT
+    try:
+        return await run_db(db, crud.create_user, user=user, schema=schemas.User)
+    except ValueError:
         raise HTTPException(status_code=400, detail="L'email est déjà enregistré")
-    return crud.create_user(db=db, user=user)
 
-@app.get("/users/", response_model=List[schemas.User], tags=["Users"])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Récupérer tous les utilisateurs avec leurs articles"""
-    users = crud.get_users(db, skip=skip, limit=limit)
-    return users
+@app.post("/users/bulk", response_model=schemas.BulkUsersResult, tags=["Users"])
+def create_users_bulk(rows: List[Any], all_or_nothing: bool = False, db: Session = Depends(get_sync_db)):
+    """
+    Créer plusieurs utilisateurs en une seule transaction
+    
+    Les lignes invalides (validation, email déjà enregistré ou en double dans le lot)
+    sont signalées dans `errors` et les autres sont créées, sauf si `all_or_nothing`
+    est activé : rien n'est alors inséré et la réponse est une erreur 400.
+    """
+    valid, errors = bulk.validate_rows(rows, schemas.UserCreate)
+    
+    # Rejeter les emails déjà enregistrés ou répétés dans le lot
+    existing = crud.get_existing_emails(db, (user.email for _, user in valid))
+    users = []
+    for index, user in valid:
+        if user.email in existing:
+            errors.append({"index": index, "detail": "L'email est déjà enregistré"})
+        else:
+            existing.add(user.email)
+            users.append(user)
+    errors.sort(key=lambda error: error["index"])
+    
+    if errors and all_or_nothing:
+        raise HTTPException(status_code=400, detail=errors)
+    
+    try:
+        created = crud.create_users_bulk(db, users)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="L'email est déjà enregistré")
+    return {"created": created, "errors": errors}
+
+@app.get("/users/", response_model=Union[List[schemas.User], schemas.UserPage], tags=["Users"])
+async def read_users(
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Récupérer tous les utilisateurs avec leurs articles
+    
+    Sans `cursor` : pagination classique skip/limit, la réponse est une liste.
+    Avec `cursor` (vide pour la première page) : pagination par clé,
+    la réponse est {"items": [...], "next_cursor": ...}.
+    
+    `fields` limite les champs lus et renvoyés (ex. `email,nom,items.title`,
+    voir business/services/projection.py) ; les articles ne sont alors
+    chargés que s'ils sont demandés.
+    
+    Les lignes lues sont validées une seule fois et encodées directement
+    (voir business/services/serialization.py).
+    """
+    user_fields, item_fields = parse_fields(projection.parse_user_fields, fields)
+    _, list_adapter, page_adapter = projection.adapters(projection.user_schema(user_fields, item_fields))
+    if cursor is not None:
+        after_id = decode_cursor(cursor)
+        users = await run_db(db, crud.get_user_rows, limit=limit + 1, after_id=after_id,
+                             fields=user_fields, item_fields=item_fields)
+        next_cursor = pagination.next_cursor(users, limit)
+        return serialization.json_response(page_adapter, {"items": users, "next_cursor": next_cursor})
+    users = await run_db(db, crud.get_user_rows, skip=skip, limit=limit, fields=user_fields, item_fields=item_fields)
+    return serialization.json_response(list_adapter, users)
+
+@app.get("/users/summary", response_model=List[schemas.UserWithItemsCount], tags=["Users"])
+async def read_users_summary(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Récupérer les utilisateurs avec le nombre de leurs articles (sans les articles)"""
+    return await run_db(db, crud.get_users_with_items_count, skip=skip, limit=limit)
+
+@app.get("/users/changes", response_model=schemas.ChangesPage, tags=["Users", "Changes"])
+async def read_users_changes(since: str = "", limit: int = 100, db: Session = Depends(get_db)):
+    """Créations, modifications et suppressions d'utilisateurs depuis le curseur `since`"""
+    return await read_change_feed(db, "users", schemas.UserRecord, since, limit)
+
+@app.get("/users/{user_id}/summary", response_model=schemas.UserWithItemsCount, tags=["Users"])
+async def read_user_summary(user_id: int, db: Session = Depends(get_db)):
+    """Récupérer un utilisateur avec le nombre de ses articles (sans les articles)"""
+    db_user = await run_db(db, crud.get_user_with_items_count, user_id=user_id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+    return db_user
 
 @app.get("/users/{user_id}", response_model=schemas.User, tags=["Users"])
-def read_user(user_id: int, db: Session = Depends(get_db)):
-    """Récupérer un utilisateur par son ID avec ses articles"""
-    db_user = crud.get_user(db, user_id=user_id)
+async def read_user(user_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Récupérer un utilisateur par son ID avec ses articles (mis en cache, `fields` comme GET /users/)"""
+    user_fields, item_fields = parse_fields(projection.parse_user_fields, fields)
+    key = cache.user_key(user_id)
+    cached_user = cache.entity_cache.get(key)
+    if fields is not None:
+        # Projection : réduite depuis le cache, sinon lue sans remplir le cache
+        schema = projection.user_schema(user_fields, item_fields)
+        if cached_user is None:
+            cached_user = await run_db(
+                db, crud.get_user, user_id=user_id, items_loading="lazy" if item_fields is None else "joined",
+                fields=user_fields, item_fields=item_fields, schema=schema,
+            )
+            if cached_user is None:
+                raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+        return serialization.json_response(projection.adapters(schema)[0], cached_user)
+    if cached_user is not None:
+        return cached_user
+    
+    version = cache.entity_cache.generation(key)
+    db_user = await run_db(db, crud.get_user, user_id=user_id, items_loading="joined", schema=schemas.User)
     if db_user is None:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+    cache.entity_cache.set(key, db_user, version)
     return db_user
 
-@app.get("/users/{user_id}/items/", response_model=List[schemas.Item], tags=["Users", "Items"])
-def read_user_items(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Récupérer tous les articles d'un utilisateur spécifique"""
+@app.get("/users/{user_id}/items/", response_model=Union[List[schemas.Item], schemas.ItemPage], tags=["Users", "Items"])
+async def read_user_items(
+    user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Récupérer tous les articles d'un utilisateur spécifique (skip/limit ou `cursor`, `fields`)"""
     # Vérifier que l'utilisateur existe
-    db_user = crud.get_user(db, user_id=user_id)
+    db_user = await run_db(db, crud.get_user, user_id=user_id, fields=("id",))
     if db_user is None:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     
-    items = crud.get_items_by_user(db, user_id=user_id, skip=skip, limit=limit)
-    return items
+    return await read_items_page(db, skip, limit, cursor, fields, schemas.ItemFilters(owner_id=user_id))
 
 @app.put("/users/{user_id}", response_model=schemas.User, tags=["Users"])
-def update_user(user_id: int, user: schemas.UserUpdate, db: Session = Depends(get_db)):
+async def update_user(user_id: int, user: schemas.UserUpdate, db: Session = Depends(get_db)):
     """Mettre à jour un utilisateur"""
-    db_user = crud.update_user(db, user_id=user_id, user=user)
+    try:
+        db_user = await run_db(db, crud.update_user, user_id=user_id, user=user, schema=schemas.User)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="L'email est déjà enregistré")
     if db_user is None:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+    cache.invalidate_user(user_id)
+    return db_user
+
+@app.put("/users/by-email/{email}", response_model=schemas.User, tags=["Users"])
+async def upsert_user_by_email(email: str, user: schemas.UserUpsert, db: Session = Depends(get_db)):
+    """
+    Créer ou remplacer l'utilisateur ayant cet email
+    
+    Opération atomique (INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING,
+    ou INSERT puis UPDATE sur les autres bases) : des requêtes simultanées sur
+    le même email ne créent jamais de doublon.
+    """
+    db_user = await run_db(db, crud.upsert_user_by_email, email=email, user=user)
+    cache.invalidate_user(db_user.id)
     return db_user
 
 @app.delete("/users/{user_id}", tags=["Users"])
-def delete_user(user_id: int, db: Session = Depends(get_db)):
+async def delete_user(user_id: int, db: Session = Depends(get_db)):
     """Supprimer un utilisateur et tous ses articles (CASCADE)"""
-    # Vérifier que l'utilisateur existe d'abord
-    db_user = crud.get_user(db, user_id=user_id)
-    if db_user is None:
+    item_ids = await run_db(db, crud.delete_user, user_id=user_id)
+    if item_ids is None:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    
-    # Compter les articles qui seront supprimés
-    items_count = len(db_user.items)
-    
-    success = crud.delete_user(db, user_id=user_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Erreur lors de la suppression")
+    items_count = len(item_ids)
+    cache.invalidate_user(user_id, item_ids)
     
     message = f"Utilisateur supprimé avec succès"
     if items_count > 0:
@@ -94,49 +288,125 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
 
 # Endpoints pour les articles
 @app.post("/users/{user_id}/items/", response_model=schemas.Item, tags=["Items"])
-def create_item_for_user(
+async def create_item_for_user(
     user_id: int, item: schemas.ItemCreate, db: Session = Depends(get_db)
 ):
     """Créer un nouvel article pour un utilisateur"""
-    # Vérifier que l'utilisateur existe
-    db_user = crud.get_user(db, user_id=user_id)
-    if db_user is None:
+    # L'existence de l'utilisateur est vérifiée par la clé étrangère lors de l'INSERT
+    try:
+        db_item = await run_db(db, crud.create_user_item, item=item, user_id=user_id)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé. Vous devez d'abord créer un utilisateur.")
-    return crud.create_user_item(db=db, item=item, user_id=user_id)
+    cache.invalidate_user(user_id)
+    return db_item
 
-@app.get("/items/", response_model=List[schemas.Item], tags=["Items"])
-def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Récupérer tous les articles"""
-    items = crud.get_items(db, skip=skip, limit=limit)
-    return items
+@app.post("/users/{user_id}/items/bulk", response_model=schemas.BulkItemsResult, tags=["Items"])
+def create_items_bulk_for_user(
+    user_id: int, rows: List[Any], all_or_nothing: bool = False, db: Session = Depends(get_sync_db)
+):
+    """
+    Créer plusieurs articles pour un utilisateur en une seule transaction
+    
+    Les lignes invalides sont signalées dans `errors` et les autres sont créées,
+    sauf si `all_or_nothing` est activé (erreur 400, rien n'est inséré).
+    """
+    valid, errors = bulk.validate_rows(rows, schemas.ItemCreate)
+    
+    # Sans INSERT (aucune ligne valide ou refus global), la clé étrangère ne vérifie pas l'utilisateur
+    rejected = not valid or (errors and all_or_nothing)
+    if rejected and crud.get_user(db, user_id=user_id) is None:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé. Vous devez d'abord créer un utilisateur.")
+    if errors and all_or_nothing:
+        raise HTTPException(status_code=400, detail=errors)
+    
+    try:
+        created = crud.create_user_items_bulk(db, [item for _, item in valid], user_id=user_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé. Vous devez d'abord créer un utilisateur.")
+    cache.invalidate_user(user_id)
+    return {"created": created, "errors": errors}
+
+@app.get("/items/", response_model=Union[List[schemas.Item], schemas.ItemPage], tags=["Items"])
+async def read_items(
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None,
+    owner_id: Optional[int] = None, is_available: Optional[bool] = None,
+    min_price: Optional[int] = None, max_price: Optional[int] = None,
+    created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+    sort: str = "id", db: Session = Depends(get_db),
+):
+    """
+    Récupérer tous les articles (skip/limit ou pagination par clé avec `cursor`)
+    
+    Filtres : `owner_id`, `is_available`, `min_price` et `max_price` (inclus,
+    en centimes), `created_after` et `created_before` (exclus).
+    `sort` : id, price, created_at ou title, préfixé de `-` pour un tri
+    décroissant (ex. `-price`).
+    `fields` limite les colonnes lues et renvoyées (ex. `title,price`).
+    """
+    filters = schemas.ItemFilters(
+        owner_id=owner_id, is_available=is_available, min_price=min_price, max_price=max_price,
+        created_after=created_after, created_before=created_before,
+    )
+    return await read_items_page(db, skip, limit, cursor, fields, filters, sort)
+
+@app.get("/items/changes", response_model=schemas.ChangesPage, tags=["Items", "Changes"])
+async def read_items_changes(since: str = "", limit: int = 100, db: Session = Depends(get_db)):
+    """
+    Créations, modifications et suppressions d'articles depuis le curseur `since`
+    
+    Chaque changement donne l'état actuel de l'article (`data`, null s'il a été
+    supprimé). Le client conserve `next_cursor` et le renvoie comme `since` pour
+    n'obtenir que les changements suivants ; `has_more` indique qu'il reste des
+    changements à lire immédiatement.
+    """
+    return await read_change_feed(db, "items", schemas.Item, since, limit)
 
 @app.get("/items/{item_id}", response_model=schemas.Item, tags=["Items"])
-def read_item(item_id: int, db: Session = Depends(get_db)):
-    """Récupérer un article par son ID"""
-    db_item = crud.get_item(db, item_id=item_id)
+async def read_item(item_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Récupérer un article par son ID (mis en cache, `fields` comme GET /items/)"""
+    item_fields = parse_fields(projection.parse_item_fields, fields)
+    key = cache.item_key(item_id)
+    cached_item = cache.entity_cache.get(key)
+    if fields is not None:
+        # Projection : réduite depuis le cache, sinon lue sans remplir le cache
+        schema = projection.item_schema(item_fields)
+        if cached_item is None:
+            cached_item = await run_db(db, crud.get_item, item_id=item_id, fields=item_fields, schema=schema)
+            if cached_item is None:
+                raise HTTPException(status_code=404, detail="Article non trouvé")
+        return serialization.json_response(projection.adapters(schema)[0], cached_item)
+    if cached_item is not None:
+        return cached_item
+    
+    version = cache.entity_cache.generation(key)
+    db_item = await run_db(db, crud.get_item, item_id=item_id, schema=schemas.Item)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Article non trouvé")
+    cache.entity_cache.set(key, db_item, version)
     return db_item
 
 @app.put("/items/{item_id}", response_model=schemas.Item, tags=["Items"])
-def update_item(item_id: int, item: schemas.ItemUpdate, db: Session = Depends(get_db)):
+async def update_item(item_id: int, item: schemas.ItemUpdate, db: Session = Depends(get_db)):
     """Mettre à jour un article"""
-    db_item = crud.update_item(db, item_id=item_id, item=item)
+    db_item = await run_db(db, crud.update_item, item_id=item_id, item=item)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Article non trouvé")
+    cache.invalidate_item(item_id, db_item.owner_id)
     return db_item
 
 @app.delete("/items/{item_id}", tags=["Items"])
-def delete_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_item(item_id: int, db: Session = Depends(get_db)):
     """Supprimer un article"""
-    success = crud.delete_item(db, item_id=item_id)
-    if not success:
+    # Le propriétaire, renvoyé par le DELETE, sert à invalider sa réponse en cache
+    owner_id = await run_db(db, crud.delete_item, item_id=item_id)
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Article non trouvé")
+    cache.invalidate_item(item_id, owner_id)
     return {"message": "Article supprimé avec succès"}
 
 # Endpoint de recherche
 @app.get("/search/items", response_model=List[schemas.Item], tags=["Search"])
-def search_items(q: str, limit: int = 50, db: Session = Depends(get_db)):
+async def search_items(q: str, limit: int = 50, db: Session = Depends(get_db)):
     """
     Rechercher des articles par mot-clé dans le titre ou la description
     
@@ -151,9 +421,128 @@ def search_items(q: str, limit: int = 50, db: Session = Depends(get_db)):
         limit = 100
     
     # Recherche dans la base de données
-    items = crud.search_items(db, query=q.strip(), limit=limit)
+    items = await run_db(db, crud.search_items, query=q.strip(), limit=limit)
     return items
 
+# Endpoints d'export
+def stream_export(db: Session, stream_rows, filename: str):
+    """
+    Construit une réponse NDJSON diffusée au fil de la lecture de la table
+    
+    Le flux utilise sa propre session, fermée à la fin du flux, car la session
+    de la dépendance get_sync_db peut être fermée avant la fin de l'envoi.
+    """
+    stream_db = SessionLocal(bind=db.get_bind())
+    
+    def generate():
+        try:
+            yield from export.to_ndjson(stream_rows(stream_db))
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(
+        generate(),
+        media_type=export.NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+@app.get("/export/users.ndjson", tags=["Export"])
+def export_users(db: Session = Depends(get_sync_db)):
+    """Exporter tous les utilisateurs (un objet JSON par ligne, sans leurs articles)"""
+    return stream_export(db, crud.stream_users, "users.ndjson")
+
+@app.get("/export/items.ndjson", tags=["Export"])
+def export_items(db: Session = Depends(get_sync_db)):
+    """Exporter tous les articles (un objet JSON par ligne)"""
+    return stream_export(db, crud.stream_items, "items.ndjson")
+
+# Endpoint d'import
+@app.post("/import/items", response_model=schemas.ImportReport, tags=["Import"])
+def import_items(
+    file: UploadFile = File(...),
+    owner_id: Optional[int] = None,
+    batch_size: int = 1000,
+    db: Session = Depends(get_sync_db),
+):
+    """
+    Importer des articles depuis un fichier NDJSON (.ndjson, .jsonl) ou CSV (.csv)
+    
+    Le fichier est lu en flux et inséré par lots de `batch_size` lignes, avec un
+    commit par lot. Chaque ligne doit fournir `owner_id`, sauf si le paramètre
+    `owner_id` donne un propriétaire par défaut. Les lignes invalides (y compris
+    mal encodées) sont signalées dans le rapport (numéro de ligne) sans
+    interrompre l'import ; un fichier illisible renvoie une 400 indiquant le
+    nombre d'articles déjà importés.
+    """
+    if batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size doit être supérieur à 0")
+    try:
+        records = importer.read_records(file.file, file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return importer.import_items(db, records, batch_size=batch_size, default_owner_id=owner_id)
+    except importer.ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        # Les listes d'articles de propriétaires quelconques ont pu changer
+        cache.entity_cache.clear()
+
+# Suivi des changements
+@app.get("/changes/version", response_model=schemas.TableVersions, tags=["Changes"])
+async def read_changes_version(db: Session = Depends(get_db)):
+    """
+    Version courante des tables users et items
+    
+    Chaque écriture incrémente la version des tables modifiées dans sa propre
+    transaction : si les versions n'ont pas changé depuis le dernier appel,
+    le client peut éviter de recharger les listes.
+    """
+    return await run_db(db, crud.get_versions)
+
+@app.get("/events", tags=["Changes"])
+async def stream_events(last_event_id: Optional[int] = Header(None)):
+    """
+    Flux Server-Sent Events des changements (users et items)
+    
+    Chaque événement `change` a pour ID celui du journal des changements et
+    pour données {"id", "table", "op", "row_id"} : le client ne recharge que
+    les lignes concernées. Après une déconnexion, l'en-tête Last-Event-ID
+    rejoue les changements manqués. Un client trop lent reçoit un événement
+    `resync` à la place des événements qu'il n'a pas lus.
+    """
+    subscriber = await events.broadcaster.subscribe(last_event_id)
+    return StreamingResponse(
+        events.broadcaster.stream(subscriber),
+        media_type=events.EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Statistiques agrégées
+@app.get("/stats", response_model=schemas.Stats, tags=["Stats"])
+async def read_stats(owners: int = 100, db: Session = Depends(get_db)):
+    """
+    Totaux, prix (min, max, moyenne, centiles) et articles par propriétaire
+
+    Calculé en deux requêtes agrégées et mis en cache STATS_CACHE_TTL
+    secondes : les chiffres peuvent être en retard d'au plus cette durée.
+    `owners` limite la liste des propriétaires (ceux ayant le plus d'articles).
+    """
+    if owners < 0:
+        raise HTTPException(status_code=400, detail="owners doit être positif ou nul")
+    key = cache.stats_key(owners)
+    stats = cache.stats_cache.get(key)
+    if stats is None:
+        stats = await run_db(db, crud.get_stats, owners_limit=owners)
+        cache.stats_cache.set(key, stats)
+    return stats
+
+# Endpoint de supervision
+@app.get("/cache/stats", tags=["Monitoring"])
+def read_cache_stats():
+    """Statistiques du cache des lectures unitaires (succès, échecs, évictions)"""
+    return cache.entity_cache.stats()
+
 if __name__ == "__main__":
     import uvicorn
     import socket
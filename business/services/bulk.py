@@ -0,0 +1,32 @@
+"""
+Validation ligne par ligne des créations en lot
+"""
+
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Résume une erreur de validation Pydantic sur une ligne"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'ligne'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def validate_rows(rows: List[Any], schema: Type[BaseModel]) -> Tuple[List[Tuple[int, BaseModel]], List[Dict]]:
+    """
+    Valide chaque ligne d'un lot avec le schéma donné
+
+    Returns:
+        (lignes valides sous forme de (index, modèle), erreurs sous forme de {"index", "detail"})
+    """
+    valid = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as e:
+            errors.append({"index": index, "detail": format_validation_error(e)})
+    return valid, errors
@@ -0,0 +1,370 @@
+"""
+Cache des réponses GET /users/{id}, GET /items/{id} et GET /stats
+
+Deux backends, choisis par CACHE_BACKEND :
+- memory : cache TTL + LRU propre au processus (un seul worker uvicorn) ;
+- redis : cache partagé par tous les workers. Chaque worker garde un cache
+  local devant Redis ; une invalidation supprime les clés dans Redis et publie
+  un message (ids des utilisateurs/articles) pour que les autres workers
+  vident leur cache local.
+
+Les entrées expirent après CACHE_TTL secondes. Les endpoints d'écriture
+invalident précisément les clés concernées (l'utilisateur dont la liste
+d'articles change, l'article modifié).
+
+Les statistiques agrégées (GET /stats) ont leur propre cache mémoire à durée
+courte (STATS_CACHE_TTL secondes), sans invalidation : un tableau de bord
+rafraîchi par plusieurs clients ne relance les requêtes d'agrégation qu'une
+fois par période, au prix de chiffres en retard d'au plus cette durée.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from fastapi.encoders import jsonable_encoder
+
+# Configuration (CACHE_TTL=0 désactive le cache)
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "5"))
+
+
+class TTLCache:
+    """Cache clé/valeur borné en taille (LRU) et en durée (TTL), utilisable entre threads"""
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Incrémenté à chaque invalidation : une lecture commencée avant une
+        # écriture ne doit pas remettre en cache une valeur périmée
+        self.version = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur en cache ou None (entrée absente ou expirée)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, key: Hashable) -> int:
+        """Jeton à lire avant d'interroger la base, puis à passer à set() (ici : la version du cache)"""
+        return self.version
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None):
+        """
+        Met une valeur en cache
+
+        Si `version` est fourni (valeur de `self.version` lue avant d'interroger
+        la base), la valeur est ignorée lorsqu'une invalidation a eu lieu depuis.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, keys: Iterable[Hashable]):
+        """Supprime les clés données"""
+        with self._lock:
+            self.version += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self.version += 1
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs pour la supervision"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "max_entries": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+class RedisCache:
+    """
+    Cache partagé via Redis, avec un TTLCache local par worker
+
+    Les valeurs sont stockées en JSON sous `<prefix>:<type>:<id>`. Les
+    invalidations sont diffusées sur `channel` sous la forme
+    {"origin": ..., "keys": [["user", 1], ["item", 3]]} ou {"clear": true}.
+
+    Chaque invalidation incrémente aussi dans Redis une génération par clé
+    (`<prefix>:<type>:<id>:gen`, `<prefix>:epoch` pour clear) : l'écriture
+    d'une valeur lue en base n'a lieu (WATCH/MULTI) que si la génération lue
+    avant la requête n'a pas changé, même si l'invalidation vient d'un autre
+    worker dont le message n'est pas encore arrivé.
+    """
+
+    def __init__(self, client, ttl: float = CACHE_TTL, local_maxsize: int = CACHE_MAX_ENTRIES,
+                 prefix: str = "cache", channel: str = "cache:invalidate"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.channel = channel
+        self.local = TTLCache(maxsize=local_maxsize, ttl=ttl)
+        self.origin = uuid.uuid4().hex
+        # Les générations doivent survivre à toute lecture en cours (puis expirent)
+        self.generation_ttl = max(ttl * 10, 600)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._listener = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def version(self) -> int:
+        # Incrémentée aussi par les invalidations reçues des autres workers
+        return self.local.version
+
+    def _redis_key(self, key) -> str:
+        return ":".join([self.prefix, *map(str, key)])
+
+    def _generation_keys(self, key) -> Tuple[str, str]:
+        return f"{self._redis_key(key)}:gen", f"{self.prefix}:epoch"
+
+    def generation(self, key: Hashable) -> Tuple[int, Optional[tuple]]:
+        """
+        Jeton à lire avant d'interroger la base, puis à passer à set()
+
+        Version locale et générations partagées (clé et clear) ; ces dernières
+        valent None si Redis est indisponible (la valeur n'ira alors pas dans Redis).
+        """
+        version = self.local.version
+        try:
+            shared = tuple(self.client.mget(*self._generation_keys(key)))
+        except Exception:
+            self.errors += 1
+            shared = None
+        return version, shared
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cherche dans le cache local puis dans Redis (les erreurs Redis comptent comme un échec)"""
+        if not self.enabled:
+            return None
+        value = self.local.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        version = self.local.version
+        try:
+            raw = self.client.get(self._redis_key(key))
+        except Exception:
+            self.errors += 1
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        value = json.loads(raw)
+        self.local.set(key, value, version)
+        return value
+
+    def set(self, key: Hashable, value: Any, version: Optional[Union[int, tuple]] = None):
+        """
+        Met une valeur en cache localement et dans Redis
+
+        `version` est le jeton de generation() : la valeur est ignorée si une
+        invalidation a eu lieu depuis, dans ce worker ou dans un autre.
+        """
+        local_version, shared = version if isinstance(version, tuple) else (version, None)
+        if not self.enabled or (local_version is not None and local_version != self.local.version):
+            return
+        redis_key = self._redis_key(key)
+        payload = json.dumps(jsonable_encoder(value))
+        try:
+            if isinstance(version, tuple):
+                if shared is None or not self._set_if_generation(key, redis_key, payload, shared):
+                    return
+            else:
+                self.client.set(redis_key, payload, px=int(self.ttl * 1000))
+        except Exception:
+            # Redis indisponible : les invalidations des autres workers ne sont plus garanties
+            self.errors += 1
+            return
+        self.local.set(key, value, local_version)
+
+    def _set_if_generation(self, key, redis_key: str, payload: str, shared: tuple) -> bool:
+        """Écrit la valeur dans Redis si les générations n'ont pas changé (WATCH/MULTI)"""
+        from redis.exceptions import WatchError
+
+        generation_keys = self._generation_keys(key)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(*generation_keys)
+                if tuple(pipe.mget(*generation_keys)) != shared:
+                    return False
+                pipe.multi()
+                pipe.set(redis_key, payload, px=int(self.ttl * 1000))
+                pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    def invalidate(self, keys: Iterable[Hashable]):
+        """Supprime les clés localement et dans Redis, puis prévient les autres workers"""
+        keys = list(keys)
+        self.local.invalidate(keys)
+        if not keys:
+            return
+        try:
+            pipe = self.client.pipeline()
+            pipe.delete(*(self._redis_key(key) for key in keys))
+            for key in keys:
+                generation_key = self._generation_keys(key)[0]
+                pipe.incr(generation_key)
+                pipe.expire(generation_key, int(self.generation_ttl))
+            pipe.publish(self.channel, json.dumps({"origin": self.origin, "keys": keys}))
+            pipe.execute()
+        except Exception:
+            self.errors += 1
+
+    def clear(self):
+        """Vide le cache local, les clés Redis du préfixe et les caches des autres workers"""
+        self.local.clear()
+        try:
+            epoch_key = f"{self.prefix}:epoch"
+            self.client.incr(epoch_key)
+            for redis_key in self.client.scan_iter(match=f"{self.prefix}:*"):
+                # Les générations restent : une lecture en cours doit les voir changer
+                if not redis_key.endswith(b":gen") and redis_key != epoch_key.encode():
+                    self.client.delete(redis_key)
+            self.client.publish(self.channel, json.dumps({"origin": self.origin, "clear": True}))
+        except Exception:
+            self.errors += 1
+
+    def handle_message(self, message: Dict[str, Any]):
+        """Applique au cache local une invalidation publiée par un autre worker"""
+        payload = json.loads(message["data"])
+        if payload.get("origin") == self.origin:
+            return
+        if payload.get("clear"):
+            self.local.clear()
+        else:
+            self.local.invalidate(tuple(key) for key in payload.get("keys", []))
+
+    def start_listener(self):
+        """Écoute les invalidations des autres workers dans un thread dédié"""
+        if self._listener is None:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self.handle_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=0.1, daemon=True, exception_handler=self._on_listener_error
+            )
+        return self
+
+    def _on_listener_error(self, error, pubsub, thread):
+        # Redis indisponible : le cache local pourrait manquer des invalidations,
+        # il est vidé puis l'écoute reprend (le client se reconnecte)
+        self.errors += 1
+        self.local.clear()
+        time.sleep(1)
+
+    def close(self):
+        """Arrête l'écoute des invalidations"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener.join(timeout=2)
+            self._listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs pour la supervision (succès local ou Redis)"""
+        lookups = self.hits + self.misses
+        local = self.local.stats()
+        return {
+            "backend": "redis",
+            "enabled": self.enabled,
+            "size": local["size"],
+            "max_entries": local["max_entries"],
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "local_hits": local["hits"],
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": local["evictions"],
+            "errors": self.errors,
+        }
+
+
+def create_cache(backend: str = CACHE_BACKEND, redis_url: str = CACHE_REDIS_URL):
+    """Crée le cache configuré (CACHE_BACKEND=memory|redis)"""
+    if backend == "memory":
+        return TTLCache()
+    if backend == "redis":
+        # Import différé : redis n'est nécessaire qu'avec ce backend
+        import redis
+
+        return RedisCache(redis.Redis.from_url(redis_url)).start_listener()
+    raise ValueError(f"Backend de cache inconnu : {backend} (disponibles : memory, redis)")
+
+
+def user_key(user_id: int):
+    return ("user", user_id)
+
+
+def item_key(item_id: int):
+    return ("item", item_id)
+
+
+def stats_key(owners_limit: int):
+    return ("stats", owners_limit)
+
+
+# Cache partagé par les endpoints
+entity_cache = create_cache()
+stats_cache = TTLCache(maxsize=64, ttl=STATS_CACHE_TTL)
+
+
+def invalidate_user(user_id: int, item_ids: Iterable[int] = ()):
+    """Invalide un utilisateur et, s'il est supprimé, ses articles"""
+    entity_cache.invalidate([user_key(user_id), *(item_key(item_id) for item_id in item_ids)])
+
+
+def invalidate_item(item_id: int, owner_id: int):
+    """Invalide un article et son propriétaire (dont la réponse inclut les articles)"""
+    entity_cache.invalidate([item_key(item_id), user_key(owner_id)])
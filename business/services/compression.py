@@ -0,0 +1,178 @@
+"""
+Compression des réponses (gzip, brotli) négociée avec Accept-Encoding
+
+Le middleware compresse les réponses dont le corps atteint
+COMPRESSION_MINIMUM_SIZE octets, avec le meilleur encodage accepté par le
+client parmi COMPRESSION_ENCODINGS (ordre de préférence du serveur à qualité
+égale). brotli est une dépendance optionnelle : sans le module `brotli`,
+seul gzip est proposé.
+
+Les flux (exports NDJSON) sont compressés morceau par morceau et vidés à
+chaque envoi ; les Server-Sent Events et les contenus déjà compressés ne
+sont jamais touchés. Le middleware doit envelopper ETagMiddleware : l'ETag
+(faible) est calculé sur le corps non compressé et reste le même quel que
+soit l'encodage.
+"""
+
+import os
+import zlib
+from typing import Optional, Sequence, Tuple
+
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+# Configuration (COMPRESSION_ENCODINGS vide désactive la compression)
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))  # octets
+COMPRESSION_ENCODINGS = tuple(
+    name.strip() for name in os.getenv("COMPRESSION_ENCODINGS", "br,gzip").split(",") if name.strip()
+)
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Au-delà, la compression est faite dans un thread pour ne pas bloquer la boucle
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+EXCLUDED_MEDIA_TYPES = ("text/event-stream", "application/gzip", "application/zip", "image/", "audio/", "video/")
+
+
+def brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_encodings(encodings: Sequence[str] = COMPRESSION_ENCODINGS) -> Tuple[str, ...]:
+    """
+    Encodages utilisables, dans l'ordre donné (br est ignoré sans le module brotli)
+
+    Raises:
+        ValueError: si un encodage n'est pas pris en charge
+    """
+    unknown = [name for name in encodings if name not in ("br", "gzip")]
+    if unknown:
+        raise ValueError(f"Encodage inconnu : {', '.join(unknown)} (disponibles : br, gzip)")
+    return tuple(name for name in encodings if name != "br" or brotli_available())
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Choisit l'encodage à utiliser pour un en-tête Accept-Encoding
+
+    L'encodage de plus haute qualité (q) accepté par le client l'emporte ;
+    à qualité égale, l'ordre de `encodings` décide. None : pas de compression.
+    """
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            qualities[name.strip()] = quality
+    best, best_quality = None, 0.0
+    for name in encodings:
+        quality = qualities.get(name, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class _Compressor:
+    """Compression incrémentale d'un corps de réponse"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            import brotli
+
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._process = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process = self._compressor.compress
+        self.encoding = encoding
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compresse un morceau ; les morceaux intermédiaires sont vidés pour être envoyés aussitôt"""
+        output = self._process(data)
+        if self.encoding == "br":
+            return output + (self._compressor.finish() if final else self._compressor.flush())
+        return output + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI compressant les réponses selon Accept-Encoding"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+                 encodings: Sequence[str] = COMPRESSION_ENCODINGS,
+                 gzip_level: int = COMPRESSION_GZIP_LEVEL, brotli_quality: int = COMPRESSION_BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(encodings)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                if (message["status"] < 200 or message["status"] in (204, 206, 304)
+                        or "content-encoding" in headers or media_type.startswith(EXCLUDED_MEDIA_TYPES)):
+                    await send(message)
+                    return
+                # Compressible : les en-têtes attendent le premier morceau du corps
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or (start_message is None and compressor is None):
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Corps trop petit : le gain ne couvre pas le coût
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                data = await self._compress(compressor, body, not more_body)
+                headers = MutableHeaders(raw=list(start_message["headers"]))
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                del headers["content-length"]
+                if not more_body:
+                    headers["content-length"] = str(len(data))
+                await send({**start_message, "headers": headers.raw})
+                start_message = None
+            else:
+                data = await self._compress(compressor, body, not more_body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    async def _compress(compressor: _Compressor, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await to_thread.run_sync(compressor.compress, body, final)
+        return compressor.compress(body, final)
@@ -0,0 +1,77 @@
+"""
+ETag et requêtes conditionnelles (If-None-Match) pour les réponses JSON
+
+Le middleware calcule un ETag faible à partir du corps des réponses GET
+JSON (listes et détails). Si le client renvoie cet ETag dans If-None-Match,
+la réponse est remplacée par un 304 sans corps : un rafraîchissement sans
+changement ne transfère que les en-têtes.
+"""
+
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def compute_etag(body: bytes) -> str:
+    """ETag faible dérivé du contenu (indépendant de la compression)"""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Compare un en-tête If-None-Match (liste d'ETags ou *) à un ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    # Comparaison faible : le préfixe W/ est ignoré des deux côtés
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class ETagMiddleware:
+    """Middleware ASGI ajoutant ETag aux réponses GET JSON et répondant 304"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message = None
+        body = []
+
+        async def send_with_etag(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0]
+                if message["status"] == 200 and media_type == JSON_MEDIA_TYPE and "etag" not in headers:
+                    # Réponse JSON : le corps est mis en attente pour calculer l'ETag
+                    start_message = message
+                    return
+                await send(message)
+            elif start_message is None:
+                await send(message)
+            else:
+                body.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                await send_buffered(b"".join(body))
+
+        async def send_buffered(content: bytes):
+            etag = compute_etag(content)
+            headers = MutableHeaders(raw=list(start_message["headers"]))
+            headers["etag"] = etag
+            if if_none_match and etag_matches(if_none_match, etag):
+                del headers["content-length"]
+                del headers["content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start_message, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_with_etag)
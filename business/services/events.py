@@ -0,0 +1,197 @@
+"""
+Diffusion des changements aux clients connectés (Server-Sent Events)
+
+Les événements sont lus dans le journal des changements (table `changes`) :
+ils couvrent toutes les écritures, y compris celles des autres workers, et
+portent l'ID du journal, ce qui permet à un client reconnecté de reprendre
+avec l'en-tête Last-Event-ID.
+
+Une tâche de fond par worker lit les nouvelles entrées du journal dès qu'une
+session valide une écriture (ou toutes les SSE_POLL_INTERVAL secondes pour
+les écritures des autres workers) et les pousse dans la file de chaque
+abonné. Les files sont bornées (SSE_QUEUE_SIZE) : un client trop lent ne
+fait pas grossir la mémoire, ses événements en attente sont remplacés par un
+unique événement `resync` lui demandant de recharger ses données.
+"""
+
+import asyncio
+import json
+import os
+from functools import partial
+from typing import Any, Dict, Optional
+
+from anyio import to_thread
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from database.config.database import SessionLocal
+from database.repository import crud
+
+# Configuration
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+SSE_POLL_INTERVAL = float(os.getenv("SSE_POLL_INTERVAL", "1.0"))  # secondes
+SSE_HEARTBEAT = 15.0  # commentaire envoyé sans événement, garde la connexion ouverte
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+
+def format_event(name: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Formate un événement SSE"""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {name}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def change_event(change) -> Dict[str, Any]:
+    """Événement compact décrivant une entrée du journal"""
+    return {"id": change.id, "table": change.table_name, "op": change.operation, "row_id": change.row_id}
+
+
+class Subscriber:
+    """Client abonné : file bornée d'événements à envoyer"""
+
+    def __init__(self, queue_size: int, last_id: int, ready: bool = True):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.start_id = last_id
+        self.last_id = last_id
+        self.dropped = 0
+        # Tant que l'historique demandé (Last-Event-ID) n'est pas chargé,
+        # les événements en direct sont mis de côté
+        self.ready = ready
+        self._pending = []
+
+    def push(self, change: Dict[str, Any]):
+        """Ajoute un événement sans jamais bloquer la diffusion"""
+        if not self.ready:
+            self._pending.append(change)
+            return
+        if change["id"] <= self.last_id:
+            return
+        self.last_id = change["id"]
+        try:
+            self.queue.put_nowait(("change", change))
+        except asyncio.QueueFull:
+            # Client trop lent : les événements en attente sont abandonnés
+            # au profit d'un resync (le client recharge ses données)
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(("resync", {"last_id": change["id"]}))
+
+    def replay(self, backlog):
+        """Envoie l'historique puis les événements reçus pendant son chargement"""
+        self.ready = True
+        for change in [*backlog, *self._pending]:
+            self.push(change)
+        self._pending = []
+
+
+class ChangeBroadcaster:
+    """Lit le journal des changements et diffuse ses entrées aux abonnés"""
+
+    def __init__(self, session_factory, queue_size: int = SSE_QUEUE_SIZE,
+                 poll_interval: float = SSE_POLL_INTERVAL):
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.subscribers = set()
+        self.last_id = 0
+        self._loop = None
+        self._lock = None
+        self._wakeup = None
+        self._task = None
+
+    def _read(self, fn, **kwargs):
+        db = self.session_factory()
+        try:
+            return fn(db, **kwargs)
+        finally:
+            db.close()
+
+    def notify(self):
+        """Signale une écriture validée ; appelable depuis n'importe quel thread"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(wakeup.set)
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> Subscriber:
+        """
+        Abonne un client
+
+        Sans last_event_id, seuls les changements à venir sont envoyés. Sinon
+        les changements journalisés depuis cet ID sont d'abord rejoués (un
+        resync remplace l'historique s'il dépasse la taille de la file).
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._task = None
+            self.subscribers = set()
+        async with self._lock:
+            if self._task is None:
+                self.last_id = await to_thread.run_sync(self._read, crud.get_last_change_id)
+                self._task = asyncio.create_task(self._run())
+
+        if last_event_id is None or last_event_id >= self.last_id:
+            subscriber = Subscriber(self.queue_size, self.last_id if last_event_id is None else last_event_id)
+            self.subscribers.add(subscriber)
+            return subscriber
+
+        subscriber = Subscriber(self.queue_size, last_event_id, ready=False)
+        self.subscribers.add(subscriber)
+        read_backlog = partial(self._read, crud.get_change_log, after_id=last_event_id, limit=self.queue_size + 1)
+        subscriber.replay([change_event(change) for change in await to_thread.run_sync(read_backlog)])
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def _run(self):
+        """Tâche de fond : s'arrête quand il n'y a plus d'abonnés"""
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            read_changes = partial(self._read, crud.get_change_log, after_id=self.last_id)
+            try:
+                changes = await to_thread.run_sync(read_changes)
+            except Exception:
+                # Base momentanément indisponible : nouvel essai au prochain intervalle
+                continue
+            for change in changes:
+                event_data = change_event(change)
+                for subscriber in list(self.subscribers):
+                    subscriber.push(event_data)
+                self.last_id = change.id
+        self._task = None
+
+    async def stream(self, subscriber: Subscriber):
+        """Générateur du flux SSE d'un abonné (désabonné à la déconnexion)"""
+        try:
+            yield format_event("ready", {"last_id": subscriber.start_id})
+            while True:
+                try:
+                    name, data = await asyncio.wait_for(subscriber.queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield format_event(name, data, data["id"] if name == "change" else None)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# Diffuseur partagé par les endpoints
+broadcaster = ChangeBroadcaster(SessionLocal)
+
+
+@event.listens_for(Session, "after_commit")
+def notify_after_commit(session: Session):
+    """Réveille le diffuseur quand une transaction ayant journalisé des changements est validée"""
+    if session.info.pop("changes_logged", False):
+        broadcaster.notify()
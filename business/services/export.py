@@ -0,0 +1,33 @@
+"""
+Sérialisation NDJSON (un objet JSON par ligne) pour les exports en flux
+"""
+
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, Mapping
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _default(value):
+    """Encode les types non gérés par le module json"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+
+def to_ndjson(rows: Iterable[Mapping], chunk_size: int = 1000) -> Iterator[bytes]:
+    """
+    Convertit des lignes en NDJSON, regroupées par paquets de chunk_size lignes
+
+    Le regroupement limite le nombre d'écritures réseau sans jamais garder
+    plus d'un paquet en mémoire.
+    """
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(dict(row), default=_default, ensure_ascii=False))
+        if len(buffer) >= chunk_size:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
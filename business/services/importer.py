@@ -0,0 +1,212 @@
+"""
+Import d'articles en flux depuis des fichiers NDJSON ou CSV
+
+Le fichier est lu ligne par ligne, validé par lots avec `schemas.ItemImport`
+et chaque lot est inséré puis validé (commit) séparément : la mémoire utilisée
+ne dépend que de la taille des lots, pas de celle du fichier.
+
+Le décodage UTF-8 se fait lui aussi au fil de la lecture : une ligne mal
+encodée ou un enregistrement CSV mal formé est signalé comme erreur de cette
+ligne. Si le fichier cesse d'être lisible en cours de route, ImportFileError
+indique combien d'articles ont déjà été importés (les lots validés restent).
+"""
+
+import csv
+import io
+import json
+import time
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from business.services.bulk import format_validation_error
+from business.validation import schemas
+from database.repository import crud
+
+# Nombre maximum d'erreurs détaillées dans le rapport (les suivantes sont seulement comptées)
+MAX_REPORTED_ERRORS = 100
+
+# (numéro de ligne, données, message d'erreur de lecture)
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+INVALID_ENCODING = "Encodage invalide (UTF-8 attendu)"
+
+
+class ImportFileError(ValueError):
+    """Fichier illisible en cours d'import ; `report` contient ce qui a déjà été importé"""
+
+    def __init__(self, message: str, report: Dict):
+        super().__init__(message)
+        self.report = report
+
+
+def _is_valid_text(text: str) -> bool:
+    """Faux si le texte contient des octets non UTF-8 (décodés avec surrogateescape)"""
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def parse_ndjson(stream: Iterable[str]) -> Iterator[Record]:
+    """Lit un flux NDJSON (un objet JSON par ligne)"""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if not _is_valid_text(line):
+            yield line_number, None, INVALID_ENCODING
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"JSON invalide : {e.msg}"
+            continue
+        yield line_number, row, None
+
+
+def parse_csv(stream: Iterable[str]) -> Iterator[Record]:
+    """
+    Lit un flux CSV avec ligne d'en-tête ; les cellules vides prennent la valeur par défaut
+
+    Les enregistrements mal formés, mal encodés ou ayant plus de valeurs que
+    l'en-tête sont signalés comme erreurs.
+    """
+    reader = csv.DictReader(stream)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # line_num n'avance pas sur une erreur, mais la ligne fautive est consommée
+            yield reader.line_num + 1, None, f"CSV invalide : {e}"
+            continue
+        if None in row:
+            yield reader.line_num, None, f"{len(row[None])} valeur(s) de plus que de colonnes dans l'en-tête"
+            continue
+        if not all(_is_valid_text(key) and _is_valid_text(value or "") for key, value in row.items()):
+            yield reader.line_num, None, INVALID_ENCODING
+            continue
+        yield reader.line_num, {key: value for key, value in row.items() if value not in ("", None)}, None
+
+
+PARSERS = {
+    ".ndjson": parse_ndjson,
+    ".jsonl": parse_ndjson,
+    ".csv": parse_csv,
+}
+
+
+def read_records(binary_stream: BinaryIO, filename: str) -> Iterator[Record]:
+    """
+    Choisit le lecteur selon l'extension du fichier
+
+    Raises:
+        ValueError: si le format n'est pas pris en charge
+    """
+    extension = "." + filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension not in PARSERS:
+        raise ValueError(f"Format non pris en charge : {filename} (attendu : {', '.join(PARSERS)})")
+    # Octets non UTF-8 conservés (surrogateescape) pour être signalés ligne par ligne
+    text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8-sig", errors="surrogateescape", newline="")
+    return PARSERS[extension](text_stream)
+
+
+def _add_error(report: Dict, line_number: int, detail: str):
+    report["errors_count"] += 1
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"index": line_number, "detail": detail})
+
+
+def _flush(db: Session, batch: List[Tuple[int, dict]], default_owner_id: Optional[int], report: Dict):
+    """Valide un lot, vérifie les propriétaires en une requête puis insère les lignes valides"""
+    valid = []
+    for line_number, row in batch:
+        if not isinstance(row, dict):
+            _add_error(report, line_number, "Objet JSON attendu")
+            continue
+        if row.get("owner_id") is None and default_owner_id is not None:
+            row = {**row, "owner_id": default_owner_id}
+        try:
+            valid.append((line_number, schemas.ItemImport.model_validate(row)))
+        except ValidationError as e:
+            _add_error(report, line_number, format_validation_error(e))
+
+    existing_owners = crud.get_existing_user_ids(db, {item.owner_id for _, item in valid})
+    rows = []
+    for line_number, item in valid:
+        if item.owner_id in existing_owners:
+            rows.append(item.model_dump())
+        else:
+            _add_error(report, line_number, f"L'utilisateur avec l'ID {item.owner_id} n'existe pas")
+
+    crud.create_items_bulk(db, rows)
+    report["created"] += len(rows)
+
+
+def import_items(
+    db: Session,
+    records: Iterable[Record],
+    batch_size: int = 1000,
+    default_owner_id: Optional[int] = None,
+    on_batch: Optional[Callable[[Dict], None]] = None,
+) -> schemas.ImportReport:
+    """
+    Importe des articles par lots de batch_size lignes, avec un commit par lot
+
+    Args:
+        db: Session de base de données
+        records: Lignes lues par parse_ndjson/parse_csv
+        batch_size: Nombre de lignes par lot (et par transaction)
+        default_owner_id: Propriétaire des lignes sans owner_id
+        on_batch: Appelé avec le rapport intermédiaire après chaque lot
+
+    Returns:
+        Rapport d'import (lignes lues, créées, erreurs, débit)
+
+    Raises:
+        ImportFileError: si le fichier devient illisible (les lots déjà validés restent)
+    """
+    report = {"rows_read": 0, "created": 0, "errors": [], "errors_count": 0}
+    start = time.perf_counter()
+
+    def elapsed():
+        return time.perf_counter() - start
+
+    batch = []
+    records = iter(records)
+    while True:
+        try:
+            line_number, row, error = next(records)
+        except StopIteration:
+            break
+        except (UnicodeDecodeError, csv.Error, OSError) as e:
+            raise ImportFileError(
+                f"Fichier illisible après la ligne {report['rows_read']} : {e} "
+                f"({report['created']} article(s) déjà importé(s))",
+                report,
+            ) from e
+        report["rows_read"] += 1
+        if error is not None:
+            _add_error(report, line_number, error)
+            continue
+        batch.append((line_number, row))
+        if len(batch) >= batch_size:
+            _flush(db, batch, default_owner_id, report)
+            batch = []
+            if on_batch is not None:
+                on_batch({**report, "elapsed_seconds": elapsed()})
+    if batch:
+        _flush(db, batch, default_owner_id, report)
+        if on_batch is not None:
+            on_batch({**report, "elapsed_seconds": elapsed()})
+
+    elapsed_seconds = elapsed()
+    return schemas.ImportReport(
+        **report,
+        elapsed_seconds=elapsed_seconds,
+        rows_per_second=report["rows_read"] / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+    )
@@ -0,0 +1,86 @@
+"""
+Curseurs opaques pour la pagination par clé (keyset pagination)
+
+Un curseur encode l'ID du dernier élément renvoyé ; la page suivante est
+obtenue par `WHERE id > :last_id ORDER BY id`, ce qui utilise l'index de la
+clé primaire au lieu de parcourir et ignorer `skip` lignes.
+Le curseur vide ("") désigne la première page.
+
+Pour une page triée sur une autre colonne, le curseur porte aussi la valeur
+de cette colonne (`key`) : la page suivante est `WHERE (colonne, id) > (:key,
+:last_id)`. Les dates y sont encodées au format ISO 8601.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+def encode_cursor(last_id: int, key: Any = None) -> str:
+    """Encode l'ID (et la clé de tri) du dernier élément d'une page en curseur opaque"""
+    payload = {"id": last_id}
+    if key is not None:
+        payload["key"] = key.isoformat() if isinstance(key, datetime) else key
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Curseur invalide : {cursor}") from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError(f"Curseur invalide : {cursor}")
+    return payload
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Décode un curseur et retourne l'ID à partir duquel reprendre
+
+    Raises:
+        ValueError: si le curseur est invalide
+    """
+    if cursor == "":
+        return 0
+    return _decode(cursor)["id"]
+
+
+def decode_sorted_cursor(cursor: str) -> Tuple[Optional[int], Any]:
+    """
+    Décode un curseur de page triée : (ID, clé de tri), (None, None) pour la première page
+
+    Raises:
+        ValueError: si le curseur est invalide ou ne porte pas de clé de tri
+    """
+    if cursor == "":
+        return None, None
+    payload = _decode(cursor)
+    if payload.get("key") is None:
+        raise ValueError(f"Curseur invalide pour ce tri : {cursor}")
+    return payload["id"], payload["key"]
+
+
+def next_cursor(rows: list, limit: int, sort_key: Optional[str] = None) -> Optional[str]:
+    """
+    Calcule le curseur de la page suivante
+
+    `rows` (objets ORM, lignes ou dicts) doit contenir jusqu'à limit + 1
+    éléments : la présence d'un élément supplémentaire indique qu'une page
+    suivante existe. Cet élément est retiré de `rows`. Si `sort_key` est
+    donné, sa valeur pour le dernier élément est ajoutée au curseur.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    if not rows:
+        return None
+    last = rows[-1]
+
+    def value(name: str):
+        return last[name] if isinstance(last, dict) else getattr(last, name)
+
+    return encode_cursor(value("id"), value(sort_key) if sort_key else None)
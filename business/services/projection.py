@@ -0,0 +1,108 @@
+"""
+Projection des réponses de lecture (`?fields=`)
+
+`fields` est une liste de champs séparés par des virgules, par exemple
+`?fields=id,title,price`. Seules ces colonnes sont lues (liste des colonnes
+du SELECT, `load_only` pour les objets ORM) et sérialisées. L'ID est
+toujours renvoyé : il sert de clé au client et au curseur de pagination.
+
+Pour les utilisateurs, `items` ajoute les articles complets et
+`items.<champ>` n'en garde que certains champs (`?fields=email,items.title`) ;
+sans l'un ou l'autre, les articles ne sont pas chargés.
+
+Les schémas réduits sont dérivés de schemas.Item / schemas.User et gardés
+en cache, comme leurs TypeAdapter.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from business.validation import schemas
+
+ITEM_FIELDS = tuple(schemas.Item.model_fields)
+USER_FIELDS = tuple(name for name in schemas.User.model_fields if name != "items")
+
+
+def _split(fields: str) -> List[str]:
+    return [name.strip() for name in fields.split(",") if name.strip()]
+
+
+def _ordered(requested, available: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Champs demandés dans l'ordre du schéma, ID compris ; ValueError si un champ est inconnu"""
+    unknown = sorted(set(requested) - set(available))
+    if unknown:
+        raise ValueError(f"Champ(s) inconnu(s) : {', '.join(unknown)} (disponibles : {', '.join(available)})")
+    requested = {"id", *requested}
+    return tuple(name for name in available if name in requested)
+
+
+def parse_item_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Champs d'article demandés (None : tous)
+
+    Raises:
+        ValueError: si un champ est inconnu
+    """
+    if fields is None:
+        return None
+    return _ordered(_split(fields), ITEM_FIELDS)
+
+
+def parse_user_fields(fields: Optional[str]) -> Tuple[Optional[Tuple[str, ...]], Optional[Tuple[str, ...]]]:
+    """
+    Champs d'utilisateur et champs de ses articles demandés
+
+    Retourne (None, ITEM_FIELDS) sans projection : l'utilisateur complet avec
+    ses articles. Les champs d'articles valent None si les articles ne sont
+    pas demandés.
+
+    Raises:
+        ValueError: si un champ est inconnu
+    """
+    if fields is None:
+        return None, ITEM_FIELDS
+    user_fields, item_fields = [], None
+    for name in _split(fields):
+        if name == "items":
+            item_fields = list(ITEM_FIELDS)
+        elif name.startswith("items."):
+            item_fields = [*(item_fields or []), name[len("items."):]]
+        else:
+            user_fields.append(name)
+    return _ordered(user_fields, USER_FIELDS), None if item_fields is None else _ordered(item_fields, ITEM_FIELDS)
+
+
+def _subset_model(schema: Type[BaseModel], fields: Tuple[str, ...], **extra) -> Type[BaseModel]:
+    definitions = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields}
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+        **extra,
+    )
+
+
+@lru_cache(maxsize=128)
+def item_schema(fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """Schéma d'article réduit aux champs donnés (schemas.Item si None)"""
+    if fields is None or fields == ITEM_FIELDS:
+        return schemas.Item
+    return _subset_model(schemas.Item, fields)
+
+
+@lru_cache(maxsize=128)
+def user_schema(fields: Optional[Tuple[str, ...]], item_fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """Schéma d'utilisateur réduit, avec ses articles réduits si item_fields n'est pas None"""
+    if fields in (None, USER_FIELDS) and item_fields == ITEM_FIELDS:
+        return schemas.User
+    extra = {} if item_fields is None else {"items": (List[item_schema(item_fields)], [])}
+    return _subset_model(schemas.User, fields or USER_FIELDS, **extra)
+
+
+@lru_cache(maxsize=256)
+def adapters(schema: Type[BaseModel]) -> Tuple[TypeAdapter, TypeAdapter, TypeAdapter]:
+    """TypeAdapter d'un élément, d'une liste et d'une page {"items", "next_cursor"}"""
+    page = create_model(f"{schema.__name__}Page", items=(List[schema], ...), next_cursor=(Optional[str], None))
+    return TypeAdapter(schema), TypeAdapter(List[schema]), TypeAdapter(page)
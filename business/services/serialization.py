@@ -0,0 +1,57 @@
+"""
+Sérialisation JSON rapide des réponses de lecture (listes et projections)
+
+Les endpoints lisent des dicts construits à partir des tuples SQL plutôt que
+des objets ORM et construisent eux-mêmes la réponse : les données sont
+validées une seule fois par un TypeAdapter Pydantic (fourni par
+projection.adapters) puis encodées directement en octets. La Response
+retournée court-circuite la validation par `response_model` (qui reste
+utilisé pour la documentation OpenAPI).
+
+Deux encodeurs, choisis par JSON_ENCODER :
+- pydantic : TypeAdapter.dump_json (pydantic-core), sans dépendance ;
+- orjson : dump_python puis orjson.dumps (nécessite orjson).
+
+ORJSONResponse (response_class) encode avec orjson les réponses des
+endpoints qui passent encore par `response_model`.
+"""
+
+import os
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+# Configuration
+JSON_ENCODER = os.getenv("JSON_ENCODER", "pydantic")
+JSON_ENCODERS = ("pydantic", "orjson")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    # Import différé : orjson n'est nécessaire qu'avec JSON_ENCODER=orjson
+    import orjson
+
+    return orjson.dumps(content)
+
+
+class ORJSONResponse(JSONResponse):
+    """Réponse JSON encodée avec orjson (dépendance optionnelle)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
+
+
+def dump_json(adapter: TypeAdapter, data: Any, encoder: Optional[str] = None) -> bytes:
+    """Valide `data` (dicts ou objets à attributs) une seule fois et l'encode en JSON"""
+    encoder = encoder or JSON_ENCODER
+    if encoder not in JSON_ENCODERS:
+        raise ValueError(f"Encodeur JSON inconnu : {encoder} (disponibles : {', '.join(JSON_ENCODERS)})")
+    value = adapter.validate_python(data, from_attributes=True)
+    if encoder == "orjson":
+        return orjson_dumps(adapter.dump_python(value))
+    return adapter.dump_json(value)
+
+
+def json_response(adapter: TypeAdapter, data: Any, encoder: Optional[str] = None) -> Response:
+    """Réponse JSON construite à partir de `data` validé par `adapter`"""
+    return Response(dump_json(adapter, data, encoder), media_type="application/json")
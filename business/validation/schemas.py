@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 
 # Schémas pour les articles
@@ -12,6 +12,9 @@ class ItemBase(BaseModel):
 class ItemCreate(ItemBase):
     pass
 
+class ItemImport(ItemCreate):
+    owner_id: int
+
 class ItemUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -27,6 +30,15 @@ class Item(ItemBase):
     class Config:
         from_attributes = True
 
+class ItemFilters(BaseModel):
+    """Filtres de GET /items/ (None : pas de filtre ; prix inclus, dates exclues)"""
+    owner_id: Optional[int] = None
+    is_available: Optional[bool] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
 # Schémas pour les utilisateurs
 class UserBase(BaseModel):
     email: str
@@ -37,6 +49,11 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     pass
 
+class UserUpsert(BaseModel):
+    nom: str
+    prenom: str
+    is_active: bool = True
+
 class UserWithItemsCount(UserBase):
     id: int
     created_at: datetime
@@ -46,6 +63,14 @@ class UserWithItemsCount(UserBase):
     class Config:
         from_attributes = True
 
+class UserRecord(UserBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class UserUpdate(BaseModel):
     email: Optional[str] = None
     nom: Optional[str] = None
@@ -60,3 +85,75 @@ class User(UserBase):
 
     class Config:
         from_attributes = True
+
+# Schémas pour la pagination par curseur
+class ItemPage(BaseModel):
+    items: List[Item]
+    next_cursor: Optional[str] = None
+
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
+
+# Schémas pour les créations en lot
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+class BulkUsersResult(BaseModel):
+    created: List[User]
+    errors: List[BulkError] = []
+
+class BulkItemsResult(BaseModel):
+    created: List[Item]
+    errors: List[BulkError] = []
+
+class ImportReport(BaseModel):
+    rows_read: int
+    created: int
+    errors: List[BulkError] = []
+    errors_count: int = 0
+    elapsed_seconds: float
+    rows_per_second: float
+
+# Versions des tables (GET /changes/version)
+class TableVersions(BaseModel):
+    users: int = 0
+    items: int = 0
+
+# Flux de changements (GET /items/changes, GET /users/changes)
+class Change(BaseModel):
+    id: int
+    operation: str  # insert, update ou delete
+    row_id: int
+    changed_at: datetime
+    data: Optional[Union[Item, UserRecord]] = None  # état actuel, None si supprimé
+
+class ChangesPage(BaseModel):
+    changes: List[Change]
+    next_cursor: str
+    has_more: bool
+
+# Statistiques agrégées (GET /stats)
+class PriceStats(BaseModel):
+    # Prix en centimes, None sans article ; centiles par rang le plus proche
+    min: Optional[int] = None
+    max: Optional[int] = None
+    avg: Optional[float] = None
+    p50: Optional[int] = None
+    p90: Optional[int] = None
+    p95: Optional[int] = None
+    p99: Optional[int] = None
+
+class OwnerStats(BaseModel):
+    owner_id: int
+    items_count: int
+    available_items: int
+
+class Stats(BaseModel):
+    users_count: int
+    active_users: int
+    items_count: int
+    available_items: int
+    prices: PriceStats
+    owners: List[OwnerStats]
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, DateTime, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.config.database import Base
@@ -15,7 +15,9 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relation avec les articles
-    items = relationship("Item", back_populates="owner", cascade="all, delete-orphan")
+    # Les articles sont supprimés par la base (ON DELETE CASCADE) : passive_deletes
+    # évite de les charger pour les supprimer un par un
+    items = relationship("Item", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
 
 class Item(Base):
     __tablename__ = "items"
@@ -27,7 +29,56 @@ class Item(Base):
     is_available = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
 
     # Relation avec l'utilisateur
     owner = relationship("User", back_populates="items")
+
+    __table_args__ = (
+        # Filtres et tris de GET /items/ : disponibilité + fourchette de prix,
+        # articles d'un propriétaire par date de création
+        Index("ix_items_is_available_price", "is_available", "price"),
+        Index("ix_items_owner_id_created_at", "owner_id", "created_at"),
+    )
+
+# Tables dont la version est suivie (GET /changes/version)
+VERSIONED_TABLES = ("users", "items")
+
+class TableVersion(Base):
+    """Version d'une table, incrémentée dans la transaction de chaque écriture"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class Change(Base):
+    """Journal des écritures (ajouts seulement), lu par les flux de changements"""
+    __tablename__ = "changes"
+
+    id = Column(Integer, primary_key=True)  # curseur des flux
+    table_name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)  # insert, update ou delete
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_changes_table_name_id", "table_name", "id"),
+        # Pas de réutilisation d'ID par SQLite : un curseur reste valable
+        {"sqlite_autoincrement": True},
+    )
+
+@event.listens_for(TableVersion.__table__, "after_create")
+def insert_initial_versions(table, connection, **kw):
+    """Crée les lignes de version avec la table : une écriture n'a plus qu'un UPDATE à faire"""
+    connection.execute(table.insert(), [{"table_name": name, "version": 0} for name in VERSIONED_TABLES])
+
+def create_missing_indexes(bind):
+    """
+    Crée les index déclarés absents d'une base existante
+
+    create_all ne crée que les tables manquantes : un index ajouté à une
+    table déjà créée doit être créé à part.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
@@ -1,120 +1,638 @@
-from sqlalchemy.orm import Session
-from typing import Optional
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, String, case, delete, func, insert, literal, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
 from database.models import models
 from business.validation import schemas
+from database.repository import search_index
+
+# Stratégies de chargement de la relation User.items
+# - "lazy"     : aucun préchargement (un SELECT par utilisateur au premier accès)
+# - "selectin" : un seul SELECT ... WHERE owner_id IN (...) pour toute la page
+# - "joined"   : LEFT OUTER JOIN dans la requête principale
+ITEMS_LOADING_STRATEGIES = {
+    "lazy": None,
+    "selectin": selectinload,
+    "joined": joinedload,
+}
+
+# Colonnes des articles (valeur par défaut de get_user_rows : articles complets)
+ITEM_COLUMNS = tuple(column.key for column in models.Item.__table__.c)
+
+# Colonnes sur lesquelles GET /items/ peut trier
+ITEM_SORT_KEYS = ("id", "price", "created_at", "title")
+
+def _attributes(model, fields: Sequence[str]):
+    """Attributs ORM des champs donnés, pour load_only"""
+    return [getattr(model, name) for name in fields]
+
+def _with_items_loading(query, items_loading: str, item_fields: Optional[Sequence[str]] = None):
+    """Applique la stratégie de chargement des articles à une requête sur les utilisateurs"""
+    if items_loading not in ITEMS_LOADING_STRATEGIES:
+        raise ValueError(f"Stratégie de chargement inconnue : {items_loading}")
+    loader = ITEMS_LOADING_STRATEGIES[items_loading]
+    if loader is None:
+        return query
+    option = loader(models.User.items)
+    if item_fields is not None:
+        option = option.load_only(*_attributes(models.Item, item_fields))
+    return query.options(option)
+
+def _paginate(query, id_column, skip: int, limit: int, after_id: Optional[int]):
+    """
+    Applique la pagination à une requête
+    
+    Si after_id est fourni, pagination par clé (WHERE id > after_id ORDER BY id),
+    sinon pagination classique par décalage (OFFSET skip).
+    """
+    if after_id is not None:
+        return query.filter(id_column > after_id).order_by(id_column).limit(limit)
+    return query.offset(skip).limit(limit)
 
 # Opérations CRUD pour les utilisateurs
 
-def get_user(db: Session, user_id: int):
-    """Récupérer un utilisateur par son ID"""
-    return db.query(models.User).filter(models.User.id == user_id).first()
+def get_user(db: Session, user_id: int, items_loading: str = "lazy",
+             fields: Optional[Sequence[str]] = None, item_fields: Optional[Sequence[str]] = None):
+    """
+    Récupérer un utilisateur par son ID
+    
+    `fields` et `item_fields` limitent les colonnes chargées (load_only) de
+    l'utilisateur et de ses articles préchargés.
+    """
+    query = _with_items_loading(db.query(models.User), items_loading, item_fields)
+    if fields is not None:
+        query = query.options(load_only(*_attributes(models.User, fields)))
+    return query.filter(models.User.id == user_id).first()
 
 def get_user_by_email(db: Session, email: str):
     """Récupérer un utilisateur par son email"""
     return db.query(models.User).filter(models.User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    """Récupérer une liste d'utilisateurs avec pagination"""
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_existing_emails(db: Session, emails: Iterable[str]):
+    """Retourner, parmi les emails donnés, ceux qui sont déjà enregistrés"""
+    emails = list(emails)
+    if not emails:
+        return set()
+    return set(db.scalars(select(models.User.email).where(models.User.email.in_(emails))))
 
-def create_user(db: Session, user: schemas.UserCreate):
-    """Créer un nouvel utilisateur"""
-    db_user = models.User(
-        email=user.email,
-        nom=user.nom,
-        prenom=user.prenom,
-        is_active=user.is_active
+def get_existing_user_ids(db: Session, user_ids: Iterable[int]):
+    """Retourner, parmi les IDs donnés, ceux des utilisateurs existants"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return set()
+    return set(db.scalars(select(models.User.id).where(models.User.id.in_(user_ids))))
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, items_loading: str = "lazy",
+              after_id: Optional[int] = None):
+    """Récupérer une liste d'utilisateurs avec pagination (par décalage ou après un ID)"""
+    query = _with_items_loading(db.query(models.User), items_loading)
+    return _paginate(query, models.User.id, skip, limit, after_id).all()
+
+def _users_with_items_count(users_page):
+    """Joint une sélection d'utilisateurs au nombre de leurs articles (COUNT ... GROUP BY)"""
+    return (
+        select(users_page, func.count(models.Item.id).label("items_count"))
+        .outerjoin(models.Item, models.Item.owner_id == users_page.c.id)
+        .group_by(*users_page.c)
+        .order_by(users_page.c.id)
     )
-    db.add(db_user)
+
+def _row_dicts(result):
+    """Dicts construits directement à partir des tuples d'un résultat (clés lues une fois)"""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def _columns(model, fields: Optional[Sequence[str]], *required: str):
+    """Colonnes à lire : `fields` (toutes si None) plus les colonnes nécessaires à la requête"""
+    if fields is None:
+        return list(model.__table__.c)
+    names = {"id", *fields, *required}
+    return [column for column in model.__table__.c if column.key in names]
+
+def get_user_rows(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                  fields: Optional[Sequence[str]] = None,
+                  item_fields: Optional[Sequence[str]] = ITEM_COLUMNS):
+    """
+    Récupérer une page d'utilisateurs avec leurs articles, sans objets ORM
+    
+    Deux requêtes (la page d'utilisateurs puis leurs articles, comme le
+    chargement selectin) dont les tuples sont convertis en dicts : pas
+    d'identity map ni d'état d'instance à construire. Chaque utilisateur a
+    une clé "items" avec la liste de ses articles.
+    
+    Seules les colonnes `fields` (utilisateurs) et `item_fields` (articles)
+    sont lues ; item_fields=None ne charge pas les articles.
+    """
+    query = _paginate(select(*_columns(models.User, fields)), models.User.id, skip, limit, after_id)
+    users = _row_dicts(db.execute(query))
+    if item_fields is None:
+        return users
+    users_by_id = {user["id"]: user for user in users}
+    for user in users:
+        user["items"] = []
+    if users:
+        items = db.execute(
+            select(*_columns(models.Item, item_fields, "owner_id"))
+            .where(models.Item.owner_id.in_(users_by_id))
+            .order_by(models.Item.id)
+        )
+        for item in _row_dicts(items):
+            users_by_id[item["owner_id"]]["items"].append(item)
+    return users
+
+def get_users_with_items_count(db: Session, skip: int = 0, limit: int = 100):
+    """
+    Récupérer une liste d'utilisateurs avec le nombre de leurs articles
+    
+    Les articles ne sont pas chargés : le comptage est fait par une seule
+    requête agrégée sur la page d'utilisateurs demandée.
+    """
+    users_page = (
+        select(models.User.__table__)
+        .order_by(models.User.id)
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    return db.execute(_users_with_items_count(users_page)).all()
+
+def get_user_with_items_count(db: Session, user_id: int):
+    """Récupérer un utilisateur avec le nombre de ses articles"""
+    user_row = select(models.User.__table__).where(models.User.id == user_id).subquery()
+    return db.execute(_users_with_items_count(user_row)).first()
+
+def create_user(db: Session, user: schemas.UserCreate):
+    """
+    Créer un nouvel utilisateur (un seul INSERT ... RETURNING)
+    
+    L'unicité de l'email est vérifiée par l'index unique, sans lecture préalable
+    (qui laisserait deux requêtes simultanées passer la vérification).
+    
+    Raises:
+        ValueError: si l'email est déjà enregistré
+    """
+    try:
+        return _insert_many(db, models.User.__table__, [user.model_dump()])[0]
+    except IntegrityError as e:
+        db.rollback()
+        if get_user_by_email(db, email=user.email) is not None:
+            raise ValueError(f"L'email {user.email} est déjà enregistré") from e
+        raise
+
+# Instruction INSERT ... ON CONFLICT de chaque dialecte
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+def upsert_user_by_email(db: Session, email: str, user: schemas.UserUpsert):
+    """
+    Créer ou remplacer l'utilisateur ayant cet email en une instruction atomique
+    (INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING)
+    
+    Sur les bases sans ON CONFLICT (autres que SQLite et PostgreSQL), voir
+    _upsert_user_portable. Retourne l'utilisateur avec ses articles sous forme
+    de schéma.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        return _upsert_user_portable(db, email, user)
+    table = models.User.__table__
+    statement = UPSERT_INSERTS[dialect](table).values(email=email, **user.model_dump())
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.email],
+        set_={
+            "nom": statement.excluded.nom,
+            "prenom": statement.excluded.prenom,
+            "is_active": statement.excluded.is_active,
+            # onupdate n'est pas appliqué par ON CONFLICT DO UPDATE
+            "updated_at": func.now(),
+        },
+    ).returning(*table.c)
+    db_user = db.execute(statement).first()
+    
+    # updated_at n'est renseigné que si la ligne existait déjà
+    operation = "insert" if db_user.updated_at is None else "update"
+    _bump_versions(db, "users")
+    _log_changes(db, "users", operation, [db_user.id])
+    return _commit_user_with_items(db, db_user, load_items=operation == "update")
+
+def _upsert_user_portable(db: Session, email: str, user: schemas.UserUpsert, attempts: int = 3):
+    """
+    Upsert sans ON CONFLICT : INSERT, puis UPDATE ... RETURNING si l'email existe
+    
+    L'index unique départage les requêtes simultanées : l'INSERT perdant lève
+    IntegrityError et met à jour la ligne gagnante. Si celle-ci est supprimée
+    entre-temps, l'INSERT est retenté.
+    """
+    table = models.User.__table__
+    values = user.model_dump()
+    for _ in range(attempts):
+        try:
+            db_user = db.execute(insert(table).values(email=email, **values).returning(*table.c)).first()
+            operation = "insert"
+        except IntegrityError:
+            db.rollback()
+            db_user = db.execute(
+                update(table).where(table.c.email == email).values(**values).returning(*table.c)
+            ).first()
+            operation = "update"
+        if db_user is not None:
+            _bump_versions(db, "users")
+            _log_changes(db, "users", operation, [db_user.id])
+            return _commit_user_with_items(db, db_user, load_items=operation == "update")
+        db.rollback()
+    raise RuntimeError(f"Upsert de {email} impossible après {attempts} tentatives")
+
+def _commit_user_with_items(db: Session, db_user, load_items: bool = True):
+    """Valider la transaction et retourner la ligne utilisateur avec ses articles (schéma User)"""
+    items = []
+    if load_items:
+        items = db.execute(
+            select(models.Item.__table__).where(models.Item.owner_id == db_user.id).order_by(models.Item.id)
+        ).all()
+    db.commit()
+    return schemas.User.model_validate({**db_user._mapping, "items": items})
+
+def _insert_many(db: Session, table, rows: List[dict]):
+    """Insérer plusieurs lignes en un seul INSERT ... RETURNING et valider la transaction"""
+    if not rows:
+        return []
+    statement = insert(table).returning(*table.c)
+    created = db.execute(statement, rows).all()
+    _bump_versions(db, table.name)
+    _log_changes(db, table.name, "insert", [row.id for row in created])
     db.commit()
-    db.refresh(db_user)
-    return db_user
+    return created
+
+def create_users_bulk(db: Session, users: List[schemas.UserCreate]):
+    """Créer plusieurs utilisateurs dans une seule transaction"""
+    return _insert_many(db, models.User.__table__, [user.model_dump() for user in users])
+
+def _update_returning(db: Session, table, row_id: int, values: dict):
+    """
+    Mettre à jour une ligne en un seul UPDATE ... WHERE id = :id RETURNING *
+    
+    Seuls les champs fournis sont modifiés (updated_at est renseigné par la
+    colonne elle-même). Retourne la ligne modifiée, ou None si l'ID n'existe pas.
+    Sans champ à modifier, la ligne est simplement relue.
+    """
+    if not values:
+        return db.execute(select(table).where(table.c.id == row_id)).first()
+    return db.execute(
+        update(table).where(table.c.id == row_id).values(**values).returning(*table.c)
+    ).first()
 
 def update_user(db: Session, user_id: int, user: schemas.UserUpdate):
-    """Mettre à jour un utilisateur"""
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user is None:
-        return None
+    """
+    Mettre à jour un utilisateur (UPDATE ... RETURNING)
     
+    Retourne l'utilisateur modifié avec ses articles (un SELECT) sous forme de
+    schéma, les lignes lues n'étant pas des objets ORM ; ou None.
+    
+    Raises:
+        ValueError: si le nouvel email est déjà enregistré pour un autre utilisateur
+    """
     update_data = user.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_user, field, value)
+    try:
+        db_user = _update_returning(db, models.User.__table__, user_id, update_data)
+    except IntegrityError as e:
+        db.rollback()
+        existing = get_user_by_email(db, email=update_data.get("email"))
+        if existing is not None and existing.id != user_id:
+            raise ValueError(f"L'email {update_data['email']} est déjà enregistré") from e
+        raise
+    if db_user is None:
+        return None
     
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    if update_data:
+        _bump_versions(db, "users")
+        _log_changes(db, "users", "update", [user_id])
+    return _commit_user_with_items(db, db_user)
 
 def delete_user(db: Session, user_id: int):
-    """Supprimer un utilisateur"""
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user is None:
-        return False
+    """
+    Supprimer un utilisateur et ses articles en un nombre constant de requêtes
+    
+    Les articles sont supprimés par un seul DELETE ... RETURNING id (leurs IDs
+    servent au journal des changements et à l'invalidation du cache), sans être
+    chargés. La contrainte ON DELETE CASCADE de items.owner_id garantit la même
+    chose pour les suppressions faites hors du repository.
+    
+    Returns:
+        La liste des IDs des articles supprimés, ou None si l'utilisateur n'existe pas
+    """
+    item_ids = db.scalars(
+        delete(models.Item).where(models.Item.owner_id == user_id).returning(models.Item.id)
+    ).all()
+    deleted = db.execute(
+        delete(models.User).where(models.User.id == user_id).returning(models.User.id)
+    ).first()
+    if deleted is None:
+        db.rollback()
+        return None
     
-    db.delete(db_user)
+    _bump_versions(db, "users", "items")
+    _log_changes(db, "users", "delete", [user_id])
+    _log_changes(db, "items", "delete", item_ids)
     db.commit()
-    return True
+    return item_ids
+
+# Versions des tables modifiées par les écritures
+
+def _bump_versions(db: Session, *table_names: str):
+    """
+    Incrémenter la version des tables données dans la transaction en cours
+    
+    Un seul UPDATE ; les lignes manquantes (table créée sans elles) sont créées à la version 1.
+    La version est donc validée (ou annulée) avec l'écriture elle-même.
+    """
+    version = models.TableVersion
+    result = db.execute(
+        update(version)
+        .where(version.table_name.in_(table_names))
+        .values(version=version.version + 1)
+    )
+    if result.rowcount < len(table_names):
+        existing = set(db.scalars(select(version.table_name).where(version.table_name.in_(table_names))))
+        db.execute(insert(version), [
+            {"table_name": name, "version": 1} for name in table_names if name not in existing
+        ])
+
+# Verrou consultatif PostgreSQL qui ordonne les écritures dans le journal des changements
+CHANGES_LOCK_ID = 7365481
+
+def _log_changes(db: Session, table_name: str, operation: str, row_ids: Iterable[int]):
+    """
+    Ajouter au journal des changements une ligne par ID écrit, dans la transaction en cours
+    
+    Les flux lisent le journal après le dernier ID vu : un ID doit donc être
+    visible avant tout ID plus grand. Sur PostgreSQL, les IDs viennent d'une
+    séquence et deux transactions peuvent valider dans l'ordre inverse ; un
+    verrou de transaction (pg_advisory_xact_lock, libéré au commit) fait
+    attendre la transaction suivante avant qu'elle prenne ses IDs. SQLite
+    n'admet déjà qu'une écriture à la fois.
+    """
+    rows = [{"table_name": table_name, "operation": operation, "row_id": row_id} for row_id in row_ids]
+    if rows:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(select(func.pg_advisory_xact_lock(CHANGES_LOCK_ID)))
+        db.execute(insert(models.Change), rows)
+        # Lu après le commit pour prévenir les clients abonnés aux changements
+        db.info["changes_logged"] = True
+
+def get_versions(db: Session):
+    """Récupérer la version de chaque table suivie (0 si jamais modifiée)"""
+    versions = dict.fromkeys(models.VERSIONED_TABLES, 0)
+    versions.update(db.execute(select(models.TableVersion.table_name, models.TableVersion.version)).all())
+    return versions
+
+def get_last_change_id(db: Session) -> int:
+    """Récupérer l'ID du dernier changement journalisé (0 si le journal est vide)"""
+    return db.scalar(select(func.max(models.Change.id))) or 0
+
+def get_change_log(db: Session, after_id: int = 0, limit: int = 1000):
+    """Récupérer les entrées du journal, toutes tables confondues, après un ID"""
+    return (
+        db.query(models.Change)
+        .filter(models.Change.id > after_id)
+        .order_by(models.Change.id)
+        .limit(limit)
+        .all()
+    )
+
+# Modèles des tables journalisées
+CHANGE_MODELS = {"users": models.User, "items": models.Item}
+
+def get_changes(db: Session, table_name: str, after_id: int = 0, limit: int = 100):
+    """
+    Récupérer les changements d'une table après un ID du journal
+    
+    Retourne des paires (changement, ligne) dans l'ordre du journal, la ligne
+    étant l'état actuel (None si elle a été supprimée depuis).
+    """
+    model = CHANGE_MODELS[table_name]
+    return (
+        db.query(models.Change, model)
+        .outerjoin(model, model.id == models.Change.row_id)
+        .filter(models.Change.table_name == table_name, models.Change.id > after_id)
+        .order_by(models.Change.id)
+        .limit(limit)
+        .all()
+    )
 
 # Opérations CRUD pour les articles
 
-def get_item(db: Session, item_id: int):
-    """Récupérer un article par son ID"""
-    return db.query(models.Item).filter(models.Item.id == item_id).first()
+def get_item(db: Session, item_id: int, fields: Optional[Sequence[str]] = None):
+    """Récupérer un article par son ID (seulement les colonnes `fields` si donné, via load_only)"""
+    query = db.query(models.Item)
+    if fields is not None:
+        query = query.options(load_only(*_attributes(models.Item, fields)))
+    return query.filter(models.Item.id == item_id).first()
+
+def get_items(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """Récupérer une liste d'articles avec pagination (par décalage ou après un ID)"""
+    return _paginate(db.query(models.Item), models.Item.id, skip, limit, after_id).all()
+
+def parse_item_sort(sort: str) -> Tuple[str, bool]:
+    """
+    Analyse un tri d'articles ("price", "-created_at"...) : (colonne, décroissant)
+    
+    Raises:
+        ValueError: si la colonne ne fait pas partie de ITEM_SORT_KEYS
+    """
+    key = sort.removeprefix("-")
+    if key not in ITEM_SORT_KEYS:
+        raise ValueError(f"Tri inconnu : {sort} (disponibles : {', '.join(ITEM_SORT_KEYS)}, préfixe - pour décroissant)")
+    return key, sort.startswith("-")
+
+def _comparable(db: Session, column, value):
+    """
+    Valeur comparée à une colonne dans un filtre ou une clé de pagination
+    
+    Sur SQLite, les dates (CURRENT_TIMESTAMP) sont stockées en texte
+    'AAAA-MM-JJ HH:MM:SS' alors qu'un datetime est lié avec ses microsecondes
+    ('... HH:MM:SS.000000') : la comparaison, textuelle, serait fausse pour
+    les dates égales à la seconde. La valeur est donc liée au format stocké.
+    
+    Raises:
+        ValueError: si la valeur n'a pas le type de la colonne
+    """
+    if not isinstance(column.type, DateTime):
+        # bool est une sous-classe d'int : true ne doit pas passer pour un prix
+        if not isinstance(value, column.type.python_type) or isinstance(value, bool):
+            raise ValueError(f"Valeur invalide pour {column.key} : {value!r}")
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        raise ValueError(f"Valeur invalide pour {column.key} : {value!r}")
+    if db.get_bind().dialect.name != "sqlite":
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    stored = value.strftime("%Y-%m-%d %H:%M:%S") + (f".{value.microsecond:06d}" if value.microsecond else "")
+    return literal(stored, String)
 
-def get_items(db: Session, skip: int = 0, limit: int = 100):
-    """Récupérer une liste d'articles avec pagination"""
-    return db.query(models.Item).offset(skip).limit(limit).all()
+def _filter_items(db: Session, query, filters: schemas.ItemFilters):
+    """Applique les filtres de GET /items/ (servis par les index composites de la table items)"""
+    item = models.Item
+    if filters.owner_id is not None:
+        query = query.where(item.owner_id == filters.owner_id)
+    if filters.is_available is not None:
+        query = query.where(item.is_available == filters.is_available)
+    if filters.min_price is not None:
+        query = query.where(item.price >= filters.min_price)
+    if filters.max_price is not None:
+        query = query.where(item.price <= filters.max_price)
+    if filters.created_after is not None:
+        query = query.where(item.created_at > _comparable(db, item.created_at, filters.created_after))
+    if filters.created_before is not None:
+        query = query.where(item.created_at < _comparable(db, item.created_at, filters.created_before))
+    return query
+
+def get_item_rows(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                  fields: Optional[Sequence[str]] = None, filters: Optional[schemas.ItemFilters] = None,
+                  sort: str = "id", after_key: Any = None):
+    """
+    Récupérer une page d'articles filtrée et triée, sous forme de dicts sans objets ORM
+    
+    Seules les colonnes `fields` (toutes si None, plus la colonne de tri) sont
+    lues. `sort` est une colonne de ITEM_SORT_KEYS, préfixée de "-" pour un
+    tri décroissant ; l'ID départage les égalités. Pagination par décalage
+    (skip) ou par clé : après after_id, et après (after_key, after_id) pour
+    un tri sur une autre colonne que l'ID.
+    
+    Raises:
+        ValueError: si le tri ou la clé de pagination est invalide
+    """
+    key, descending = parse_item_sort(sort)
+    column = getattr(models.Item, key)
+    order = [column] if key == "id" else [column, models.Item.id]
+    query = select(*_columns(models.Item, fields, key))
+    if filters is not None:
+        query = _filter_items(db, query, filters)
+    if after_id is not None:
+        if key == "id":
+            position, bound = models.Item.id, after_id
+        else:
+            position, bound = tuple_(column, models.Item.id), tuple_(_comparable(db, column, after_key), after_id)
+        query = query.where(position < bound if descending else position > bound)
+    else:
+        query = query.offset(skip)
+    if descending:
+        order = [c.desc() for c in order]
+    query = query.order_by(*order).limit(limit)
+    return _row_dicts(db.execute(query))
 
-def get_items_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+def get_items_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100,
+                      after_id: Optional[int] = None):
     """Récupérer les articles d'un utilisateur spécifique"""
-    return db.query(models.Item).filter(models.Item.owner_id == user_id).offset(skip).limit(limit).all()
+    query = db.query(models.Item).filter(models.Item.owner_id == user_id)
+    return _paginate(query, models.Item.id, skip, limit, after_id).all()
+
+def _insert_user_items(db: Session, rows: List[dict], user_id: int):
+    """
+    Insérer des articles d'un utilisateur en s'appuyant sur la clé étrangère
+    
+    Aucune lecture préalable de l'utilisateur : si l'INSERT viole la contrainte
+    items.owner_id -> users.id, l'utilisateur n'existe pas (vérifié seulement
+    dans ce cas, pour ne pas masquer une autre violation).
+    """
+    try:
+        return _insert_many(db, models.Item.__table__, rows)
+    except IntegrityError as e:
+        db.rollback()
+        if get_user(db, user_id=user_id) is None:
+            raise ValueError(f"L'utilisateur avec l'ID {user_id} n'existe pas") from e
+        raise
 
 def create_user_item(db: Session, item: schemas.ItemCreate, user_id: int):
-    """Créer un nouvel article pour un utilisateur"""
-    # Double vérification que l'utilisateur existe
-    db_user = get_user(db, user_id=user_id)
-    if db_user is None:
-        raise ValueError(f"L'utilisateur avec l'ID {user_id} n'existe pas")
-    
-    db_item = models.Item(
-        title=item.title,
-        description=item.description,
-        price=item.price,
-        is_available=item.is_available,
-        owner_id=user_id
-    )
-    db.add(db_item)
+    """
+    Créer un nouvel article pour un utilisateur (un seul INSERT ... RETURNING)
+    
+    Raises:
+        ValueError: si l'utilisateur n'existe pas
+    """
+    return _insert_user_items(db, [{**item.model_dump(), "owner_id": user_id}], user_id)[0]
+
+def create_user_items_bulk(db: Session, items: List[schemas.ItemCreate], user_id: int):
+    """
+    Créer plusieurs articles pour un utilisateur dans une seule transaction
+    
+    Raises:
+        ValueError: si l'utilisateur n'existe pas (et qu'il y a des articles à créer)
+    """
+    rows = [{**item.model_dump(), "owner_id": user_id} for item in items]
+    return _insert_user_items(db, rows, user_id)
+
+def create_items_bulk(db: Session, rows: List[dict]):
+    """
+    Insérer des articles déjà validés (avec owner_id) en une transaction
+    
+    Seuls les IDs sont renvoyés par la base (pour le journal des changements) :
+    utilisé par les imports, qui n'ont besoin que du nombre de lignes.
+    """
+    if rows:
+        item_ids = db.execute(insert(models.Item.__table__).returning(models.Item.id), rows).scalars().all()
+        _bump_versions(db, "items")
+        _log_changes(db, "items", "insert", item_ids)
     db.commit()
-    db.refresh(db_item)
-    return db_item
+    return len(rows)
 
 def update_item(db: Session, item_id: int, item: schemas.ItemUpdate):
-    """Mettre à jour un article"""
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
+    """Mettre à jour un article (UPDATE ... RETURNING) ; retourne la ligne modifiée ou None"""
+    update_data = item.model_dump(exclude_unset=True)
+    db_item = _update_returning(db, models.Item.__table__, item_id, update_data)
     if db_item is None:
         return None
     
-    update_data = item.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_item, field, value)
-    
+    if update_data:
+        _bump_versions(db, "items")
+        _log_changes(db, "items", "update", [item_id])
     db.commit()
-    db.refresh(db_item)
     return db_item
 
 def delete_item(db: Session, item_id: int):
-    """Supprimer un article"""
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
-    if db_item is None:
-        return False
+    """
+    Supprimer un article par un seul DELETE ... RETURNING owner_id
+    
+    Returns:
+        L'ID du propriétaire (pour l'invalidation du cache), ou None si l'article n'existe pas
+    """
+    owner_id = db.scalar(
+        delete(models.Item).where(models.Item.id == item_id).returning(models.Item.owner_id)
+    )
+    if owner_id is None:
+        db.rollback()
+        return None
     
-    db.delete(db_item)
+    _bump_versions(db, "items")
+    _log_changes(db, "items", "delete", [item_id])
     db.commit()
-    return True
+    return owner_id
+
+# Parcours complet des tables (exports)
+
+def _stream_table(db: Session, table, batch_size: int):
+    """Parcourir toute une table par lots via un curseur côté serveur"""
+    statement = select(table).order_by(table.c.id).execution_options(yield_per=batch_size)
+    return db.execute(statement).mappings()
+
+def stream_users(db: Session, batch_size: int = 1000):
+    """Parcourir tous les utilisateurs sans les charger tous en mémoire"""
+    return _stream_table(db, models.User.__table__, batch_size)
+
+def stream_items(db: Session, batch_size: int = 1000):
+    """Parcourir tous les articles sans les charger tous en mémoire"""
+    return _stream_table(db, models.Item.__table__, batch_size)
 
 def search_items(db: Session, query: str, limit: int = 50):
     """
     Rechercher des articles par mot-clé dans le titre ou la description
     
+    Utilise l'index plein texte FTS5 lorsqu'il est disponible (mots recherchés
+    comme préfixes, résultats classés par pertinence BM25), sinon un ILIKE.
+    
     Args:
         db: Session de base de données
         query: Terme de recherche
@@ -123,6 +641,12 @@ def search_items(db: Session, query: str, limit: int = 50):
     Returns:
         Liste des articles correspondants
     """
+    if search_index.is_enabled(db.get_bind()):
+        match = search_index.build_match_query(query)
+        if match is not None:
+            statement = text(search_index.search_sql())
+            return db.query(models.Item).from_statement(statement).params(match=match, limit=limit).all()
+    
     # Recherche insensible à la casse dans le titre et la description
     search_pattern = f"%{query}%"
     
@@ -130,3 +654,62 @@ def search_items(db: Session, query: str, limit: int = 50):
         models.Item.title.ilike(search_pattern) |
         models.Item.description.ilike(search_pattern)
     ).limit(limit).all()
+
+STATS_PERCENTILES = (50, 90, 95, 99)
+
+def get_stats(db: Session, owners_limit: int = 100):
+    """
+    Statistiques agrégées des utilisateurs et des articles, en deux requêtes
+    
+    La première lit les totaux et les prix : les utilisateurs sont comptés par
+    deux sous-requêtes scalaires, les articles par un seul parcours numéroté
+    (row_number() sur le prix) d'où sont tirés min, max, moyenne et centiles.
+    Les centiles sont calculés par rang le plus proche : le prix de rang
+    ceil(p * n / 100), soit toujours un prix existant.
+    
+    La seconde compte les articles par propriétaire (COUNT ... GROUP BY),
+    les `owners_limit` propriétaires ayant le plus d'articles en premier.
+    """
+    ranked = select(
+        models.Item.price,
+        models.Item.is_available,
+        func.row_number().over(order_by=(models.Item.price, models.Item.id)).label("rank"),
+        func.count().over().label("total"),
+    ).subquery()
+    percentiles = {
+        f"p{percent}": func.max(case(
+            (ranked.c.rank == (ranked.c.total * percent + 99) // 100, ranked.c.price)
+        ))
+        for percent in STATS_PERCENTILES
+    }
+    totals = db.execute(select(
+        select(func.count()).select_from(models.User).scalar_subquery().label("users_count"),
+        select(func.count()).select_from(models.User).where(models.User.is_active.is_(True))
+        .scalar_subquery().label("active_users"),
+        func.count().label("items_count"),
+        func.count(case((ranked.c.is_available, 1))).label("available_items"),
+        func.min(ranked.c.price).label("min"),
+        func.max(ranked.c.price).label("max"),
+        func.avg(ranked.c.price).label("avg"),
+        *(expression.label(name) for name, expression in percentiles.items()),
+    ).select_from(ranked)).mappings().one()
+
+    items_count = func.count().label("items_count")
+    owners = db.execute(
+        select(
+            models.Item.owner_id,
+            items_count,
+            func.count(case((models.Item.is_available, 1))).label("available_items"),
+        )
+        .group_by(models.Item.owner_id)
+        .order_by(items_count.desc(), models.Item.owner_id)
+        .limit(owners_limit)
+    )
+    return {
+        "users_count": totals["users_count"],
+        "active_users": totals["active_users"],
+        "items_count": totals["items_count"],
+        "available_items": totals["available_items"],
+        "prices": {key: totals[key] for key in ("min", "max", "avg", *percentiles)},
+        "owners": _row_dicts(owners),
+    }
@@ -0,0 +1,54 @@
+"""
+Exécution des fonctions du repository depuis des endpoints asynchrones
+
+Les fonctions de `crud` sont écrites une seule fois, pour une Session
+synchrone. `run_db` les exécute :
+- avec une AsyncSession : via `AsyncSession.run_sync`, les requêtes passent
+  par le pilote asynchrone (aiosqlite, asyncpg) sans occuper de thread ;
+- avec une Session : dans un thread du pool, comme le ferait un endpoint `def`.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Optional, Type, Union
+
+from anyio import to_thread
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    # Import différé : sqlalchemy.ext.asyncio exige greenlet, inutile sans DB_ASYNC
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _to_schema(result: Any, schema: Type[BaseModel]):
+    """Convertit un objet ORM (ou une liste d'objets) avec le schéma donné"""
+    if result is None:
+        return None
+    if isinstance(result, list):
+        return [schema.model_validate(row) for row in result]
+    return schema.model_validate(result)
+
+
+async def run_db(
+    db: Union[Session, "AsyncSession"],
+    fn: Callable,
+    *args,
+    schema: Optional[Type[BaseModel]] = None,
+    **kwargs,
+):
+    """
+    Exécute fn(session, *args, **kwargs) sur la session de la requête
+
+    Si `schema` est fourni, le résultat est converti dans le même contexte :
+    les relations chargées à la demande (ex. User.items) sont lues pendant
+    l'exécution et non lors de la sérialisation de la réponse, où une
+    AsyncSession ne peut plus émettre de requête.
+    """
+    def call(session: Session):
+        result = fn(session, *args, **kwargs)
+        if schema is not None:
+            return _to_schema(result, schema)
+        return result
+
+    if isinstance(db, Session):
+        return await to_thread.run_sync(call, db)
+    return await db.run_sync(call)
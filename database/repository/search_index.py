@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Index de recherche plein texte des articles (SQLite FTS5)
+Usage: python -m database.repository.search_index [rebuild|status]
+
+La table virtuelle `items_fts` indexe `items.title` et `items.description`
+(table à contenu externe : le texte n'est pas dupliqué). Elle est tenue à
+jour par des triggers sur `items`, donc par toutes les écritures, y compris
+celles qui ne passent pas par le repository.
+"""
+
+import re
+import sys
+import weakref
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+FTS_TABLE = "items_fts"
+
+# Poids BM25 des colonnes indexées (titre, description)
+BM25_WEIGHTS = (10.0, 1.0)
+
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='items', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON items BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+# Moteurs sur lesquels l'index est disponible
+_enabled_engines = weakref.WeakSet()
+
+
+def setup_search_index(engine: Engine) -> bool:
+    """
+    Crée l'index FTS5 et ses triggers s'ils n'existent pas
+
+    L'index est reconstruit lors de sa création pour inclure les articles
+    déjà présents. Sans effet (retourne False) si la base n'est pas SQLite
+    ou si SQLite a été compilé sans FTS5.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE},
+            ).first()
+            for statement in _CREATE_STATEMENTS:
+                conn.execute(text(statement))
+            if exists is None:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError:
+        return False
+
+    mark_enabled(engine)
+    return True
+
+
+def mark_enabled(engine: Engine):
+    """
+    Déclare l'index disponible sur un moteur
+
+    Utilisé pour le moteur synchrone sous-jacent d'un moteur asynchrone
+    pointant sur la même base que celui passé à setup_search_index.
+    """
+    _enabled_engines.add(engine)
+
+
+def is_enabled(engine: Engine) -> bool:
+    """Indique si l'index plein texte est disponible sur ce moteur"""
+    return engine in _enabled_engines
+
+
+def rebuild_search_index(engine: Engine) -> int:
+    """Reconstruit entièrement l'index à partir de la table items et retourne le nombre d'articles"""
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        return conn.execute(text("SELECT COUNT(*) FROM items")).scalar()
+
+
+def build_match_query(query: str):
+    """
+    Convertit une saisie utilisateur en requête FTS5
+
+    Chaque mot devient un préfixe ("velo elec" -> "velo"* "elec"*), les mots
+    étant combinés par ET. Retourne None si la saisie ne contient aucun mot.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_sql() -> str:
+    """Requête SQL de recherche classée par pertinence BM25"""
+    title_weight, description_weight = BM25_WEIGHTS
+    return f"""
+        SELECT items.* FROM items
+        JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = items.id
+        WHERE {FTS_TABLE} MATCH :match
+        ORDER BY bm25({FTS_TABLE}, {title_weight}, {description_weight})
+        LIMIT :limit
+    """
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    from database.config.database import engine
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else "status"
+
+    if not setup_search_index(engine):
+        print("❌ Index plein texte indisponible (SQLite sans FTS5 ou base non SQLite)")
+        sys.exit(1)
+
+    if command == "rebuild":
+        count = rebuild_search_index(engine)
+        print(f"✅ Index de recherche reconstruit ({count} article(s))")
+    elif command == "status":
+        print("✅ Index de recherche FTS5 actif")
+    else:
+        print(f"❌ Commande inconnue : {command}")
+        print("Usage: python -m database.repository.search_index [rebuild|status]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script pour importer un gros fichier d'articles (NDJSON ou CSV) dans la base de données
+Usage: python examples/import_items.py fichier.ndjson|fichier.csv [--batch-size 1000] [--owner-id ID]
+
+Le fichier est lu en flux et les articles sont insérés par lots, avec un commit
+par lot : la mémoire utilisée reste constante quelle que soit la taille du fichier.
+Un fichier produit par GET /export/items.ndjson peut être réimporté tel quel.
+"""
+
+import argparse
+import os
+import sys
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from business.services import importer
+from database.config.database import SessionLocal, engine
+from database.models import models
+
+
+def print_progress(report):
+    """Affiche l'avancement après chaque lot"""
+    elapsed = report["elapsed_seconds"]
+    rate = report["rows_read"] / elapsed if elapsed > 0 else 0
+    print(f"  📦 {report['rows_read']} ligne(s) lue(s), {report['created']} créée(s), "
+          f"{report['errors_count']} erreur(s) - {rate:,.0f} lignes/s")
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description="Import d'articles NDJSON/CSV par lots")
+    parser.add_argument('file', help='Fichier à importer (.ndjson, .jsonl ou .csv)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Nombre de lignes par transaction')
+    parser.add_argument('--owner-id', type=int, default=None, help='Propriétaire des lignes sans owner_id')
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        print("❌ --batch-size doit être supérieur à 0")
+        sys.exit(1)
+
+    print(f"📥 IMPORT DES ARTICLES DEPUIS {args.file}")
+    print("=" * 45)
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        with open(args.file, "rb") as binary_stream:
+            records = importer.read_records(binary_stream, args.file)
+            report = importer.import_items(
+                db, records,
+                batch_size=args.batch_size,
+                default_owner_id=args.owner_id,
+                on_batch=print_progress,
+            )
+    except (OSError, ValueError) as e:
+        print(f"❌ Erreur : {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⏹️  Import interrompu (les lots déjà validés sont conservés)")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print()
+    print(f"✅ {report.created} article(s) créé(s) sur {report.rows_read} ligne(s) "
+          f"en {report.elapsed_seconds:.2f}s ({report.rows_per_second:,.0f} lignes/s)")
+    if report.errors_count:
+        print(f"⚠️  {report.errors_count} ligne(s) en erreur :")
+        for error in report.errors:
+            print(f"  • ligne {error.index} : {error.detail}")
+        if report.errors_count > len(report.errors):
+            print(f"  ... et {report.errors_count - len(report.errors)} autre(s)")
+
+
+if __name__ == "__main__":
+    main()
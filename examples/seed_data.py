@@ -152,26 +152,25 @@ class SeedDataManager:
         print("✅ Tables vérifiées/créées")
     
     def get_status(self):
-        """Affiche le statut actuel de la base de données"""
-        users_count = self.db.query(models.User).count()
-        items_count = self.db.query(models.Item).count()
-        active_users = self.db.query(models.User).filter(models.User.is_active == True).count()
-        available_items = self.db.query(models.Item).filter(models.Item.is_available == True).count()
+        """Affiche le statut actuel de la base de données (deux requêtes agrégées + la liste)"""
+        stats = crud.get_stats(self.db)
+        users_count = stats["users_count"]
+        items_count = stats["items_count"]
         
         print("📊 STATUT ACTUEL DE LA BASE DE DONNÉES")
         print("=" * 45)
         print(f"👥 Utilisateurs total : {users_count}")
-        print(f"👥 Utilisateurs actifs : {active_users}")
+        print(f"👥 Utilisateurs actifs : {stats['active_users']}")
         print(f"📦 Articles total : {items_count}")
-        print(f"📦 Articles disponibles : {available_items}")
+        print(f"📦 Articles disponibles : {stats['available_items']}")
         
         if users_count > 0:
             print("\n👥 LISTE DES UTILISATEURS :")
-            users = self.db.query(models.User).all()
+            # Nombre d'articles compté par la base, sans charger user.items
+            users = crud.get_users_with_items_count(self.db, limit=users_count)
             for user in users:
                 status = "🟢 Actif" if user.is_active else "🔴 Inactif"
-                items_count = len(user.items)
-                print(f"  • {user.prenom} {user.nom} ({user.email}) - {status} - {items_count} article(s)")
+                print(f"  • {user.prenom} {user.nom} ({user.email}) - {status} - {user.items_count} article(s)")
         
         return users_count, items_count
     
@@ -0,0 +1,63 @@
+"""
+Compteur de requêtes SQL pour détecter les problèmes N+1
+Usage:
+    with count_queries(engine) as counter:
+        ...
+    print(counter.count)
+
+    with assert_max_queries(engine, 2):
+        ...
+"""
+
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Enregistre les requêtes SQL exécutées sur un moteur SQLAlchemy"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        """Nombre de requêtes exécutées"""
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        return False
+
+
+def count_queries(engine: Engine) -> QueryCounter:
+    """Retourne un gestionnaire de contexte qui compte les requêtes SQL"""
+    return QueryCounter(engine)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, max_queries: int):
+    """
+    Échoue si le bloc exécute plus de max_queries requêtes SQL
+
+    Args:
+        engine: Moteur SQLAlchemy surveillé
+        max_queries: Nombre maximum de requêtes autorisées
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > max_queries:
+        details = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(counter.statements))
+        raise AssertionError(
+            f"{counter.count} requêtes exécutées (maximum autorisé : {max_queries}) :\n{details}"
+        )
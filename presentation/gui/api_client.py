@@ -4,12 +4,16 @@ Client API pour communiquer avec le service FastAPI CRUD
 
 import requests
 import json
+from collections import OrderedDict
 from typing import List, Dict, Optional, Union
 
 
 class FastAPIClient:
     """Client pour interagir avec l'API FastAPI CRUD"""
     
+    # Nombre de réponses gardées pour les GET conditionnels (les moins récentes sont oubliées)
+    ETAG_CACHE_SIZE = 32
+    
     def __init__(self, base_url: str = "http://localhost:8000"):
         """
         Initialise le client API
@@ -19,10 +23,48 @@ class FastAPIClient:
         """
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        # Accept-Encoding reste celui de requests (gzip, deflate, et br si le module
+        # brotli est installé) : les réponses compressées sont décodées automatiquement
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
+        # Dernière réponse reçue par URL, avec son ETag : (etag, données), en LRU
+        self._etag_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # True si le dernier GET conditionnel a reçu 304 (données inchangées)
+        self.last_not_modified = False
+    
+    def _get_json(self, path: str, params: Optional[Dict] = None) -> Union[List[Dict], Dict]:
+        """
+        GET conditionnel : envoie l'ETag de la réponse précédente (If-None-Match)
+        et réutilise les données gardées si l'API répond 304
+        
+        Args:
+            path: Chemin de l'endpoint (ex: /users/)
+            params: Paramètres de la requête
+        
+        Returns:
+            List[Dict] ou Dict: Données JSON ou message d'erreur
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._etag_cache.get(key)
+        if cached is not None:
+            self._etag_cache.move_to_end(key)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers)
+        self.last_not_modified = response.status_code == 304 and cached is not None
+        if self.last_not_modified:
+            return cached[1]
+        if response.status_code == 200:
+            data = response.json()
+            etag = response.headers.get('ETag')
+            if etag:
+                self._etag_cache[key] = (etag, data)
+                self._etag_cache.move_to_end(key)
+                while len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+            return data
+        return {"error": f"Status {response.status_code}: {response.text}"}
     
     def test_connection(self) -> bool:
         """
@@ -53,6 +95,96 @@ class FastAPIClient:
         except Exception as e:
             return {"error": str(e)}
     
+    def get_changes_version(self) -> Dict:
+        """
+        Récupère la version courante des tables (users, items)
+        
+        Returns:
+            Dict: Versions ({"users": n, "items": n}) ou message d'erreur
+        """
+        try:
+            return self._get_json("/changes/version")
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def get_items_changes(self, since: str = "", limit: int = 100) -> Dict:
+        """
+        Récupère les changements d'articles depuis un curseur
+        
+        Args:
+            since: Curseur renvoyé par l'appel précédent (vide : depuis le début)
+            limit: Nombre maximum de changements
+        
+        Returns:
+            Dict: {"changes": [...], "next_cursor": ..., "has_more": ...} ou message d'erreur
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/items/changes", params={"since": since, "limit": limit})
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {"error": f"Status {response.status_code}: {response.text}"}
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def iter_events(self, last_event_id: Optional[int] = None, on_connect=None):
+        """
+        Écoute le flux de changements /events (Server-Sent Events)
+        
+        Args:
+            last_event_id: ID du dernier changement reçu, pour rejouer ceux manqués
+            on_connect: Appelé avec la réponse en flux dès la connexion, pour
+                pouvoir l'interrompre depuis un autre thread (close_stream)
+        
+        Yields:
+            tuple: (nom de l'événement, données) ex: ("change", {"table": "items", ...})
+        """
+        headers = {'Accept': 'text/event-stream'}
+        if last_event_id is not None:
+            headers['Last-Event-ID'] = str(last_event_id)
+        # Connexion propre au flux (utilisable depuis un autre thread que la session) ;
+        # délai de lecture supérieur à l'intervalle des messages de maintien (15 s)
+        with requests.get(f"{self.base_url}/events", headers=headers, stream=True, timeout=(5, 60)) as response:
+            response.raise_for_status()
+            if on_connect is not None:
+                on_connect(response)
+            yield from self.parse_event_stream(response.iter_lines(decode_unicode=True))
+    
+    @staticmethod
+    def close_stream(response):
+        """
+        Interrompt une réponse en flux depuis un autre thread
+        
+        La socket est coupée (urllib3 >= 2.3) pour débloquer immédiatement une
+        lecture en attente, puis la réponse est fermée.
+        """
+        shutdown = getattr(response.raw, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+        response.close()
+    
+    @staticmethod
+    def parse_event_stream(lines):
+        """
+        Découpe les lignes d'un flux SSE en événements
+        
+        Args:
+            lines: Lignes du flux (sans les fins de ligne)
+        
+        Yields:
+            tuple: (nom de l'événement, données JSON décodées)
+        """
+        name, data = "message", []
+        for line in lines:
+            if not line:
+                if data:
+                    yield name, json.loads("\n".join(data))
+                name, data = "message", []
+            elif line.startswith("event:"):
+                name = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].strip())
+    
     # ==================== UTILISATEURS ====================
     
     def get_users(self, skip: int = 0, limit: int = 100) -> Union[List[Dict], Dict]:
@@ -68,11 +200,24 @@ class FastAPIClient:
         """
         try:
             params = {"skip": skip, "limit": limit}
-            response = self.session.get(f"{self.base_url}/users/", params=params)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Status {response.status_code}: {response.text}"}
+            return self._get_json("/users/", params=params)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def get_users_summary(self, skip: int = 0, limit: int = 100) -> Union[List[Dict], Dict]:
+        """
+        Récupère la liste des utilisateurs avec leur nombre d'articles (sans les articles)
+        
+        Args:
+            skip: Nombre d'utilisateurs à ignorer
+            limit: Nombre maximum d'utilisateurs à récupérer
+        
+        Returns:
+            List[Dict] ou Dict: Liste des utilisateurs (avec items_count) ou message d'erreur
+        """
+        try:
+            params = {"skip": skip, "limit": limit}
+            return self._get_json("/users/summary", params=params)
         except Exception as e:
             return {"error": str(e)}
     
@@ -87,11 +232,7 @@ class FastAPIClient:
             Dict: Données de l'utilisateur ou message d'erreur
         """
         try:
-            response = self.session.get(f"{self.base_url}/users/{user_id}")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Status {response.status_code}: {response.text}"}
+            return self._get_json(f"/users/{user_id}")
         except Exception as e:
             return {"error": str(e)}
     
@@ -166,43 +307,39 @@ class FastAPIClient:
     
     # ==================== ARTICLES ====================
     
-    def get_items(self, skip: int = 0, limit: int = 100) -> Union[List[Dict], Dict]:
+    def get_items(self, skip: int = 0, limit: int = 100, fields: Optional[str] = None) -> Union[List[Dict], Dict]:
         """
         Récupère la liste des articles
         
         Args:
             skip: Nombre d'articles à ignorer
             limit: Nombre maximum d'articles à récupérer
+            fields: Champs à récupérer, séparés par des virgules (tous si None)
         
         Returns:
             List[Dict] ou Dict: Liste des articles ou message d'erreur
         """
         try:
             params = {"skip": skip, "limit": limit}
-            response = self.session.get(f"{self.base_url}/items/", params=params)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Status {response.status_code}: {response.text}"}
+            if fields is not None:
+                params["fields"] = fields
+            return self._get_json("/items/", params=params)
         except Exception as e:
             return {"error": str(e)}
     
-    def get_item(self, item_id: int) -> Union[Dict, Dict]:
+    def get_item(self, item_id: int, fields: Optional[str] = None) -> Union[Dict, Dict]:
         """
         Récupère un article par son ID
         
         Args:
             item_id: ID de l'article
+            fields: Champs à récupérer, séparés par des virgules (tous si None)
         
         Returns:
             Dict: Données de l'article ou message d'erreur
         """
         try:
-            response = self.session.get(f"{self.base_url}/items/{item_id}")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Status {response.status_code}: {response.text}"}
+            return self._get_json(f"/items/{item_id}", params=None if fields is None else {"fields": fields})
         except Exception as e:
             return {"error": str(e)}
     
@@ -137,7 +137,7 @@ class UsersTab(QWidget):
     
     def refresh_users(self):
         """Actualise la liste des utilisateurs"""
-        users = self.api_client.get_users()
+        users = self.api_client.get_users_summary()
         
         if isinstance(users, dict) and "error" in users:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement: {users['error']}")
@@ -151,7 +151,7 @@ class UsersTab(QWidget):
             self.users_table.setItem(row, 2, QTableWidgetItem(user['nom']))
             self.users_table.setItem(row, 3, QTableWidgetItem(user['prenom']))
             self.users_table.setItem(row, 4, QTableWidgetItem("Oui" if user['is_active'] else "Non"))
-            self.users_table.setItem(row, 5, QTableWidgetItem(str(len(user.get('items', [])))))
+            self.users_table.setItem(row, 5, QTableWidgetItem(str(user['items_count'])))
         
         # Ajuster la taille des colonnes
         self.users_table.resizeColumnsToContents()
@@ -193,6 +193,9 @@ class UsersTab(QWidget):
 class ItemsTab(QWidget):
     """Onglet de gestion des articles"""
     
+    # Champs affichés dans la table (?fields= : dates non transférées)
+    TABLE_FIELDS = "title,description,price,is_available,owner_id"
+    
     def __init__(self, api_client: FastAPIClient):
         super().__init__()
         self.api_client = api_client
@@ -299,7 +302,7 @@ class ItemsTab(QWidget):
     
     def refresh_users_combo(self):
         """Actualise la liste des utilisateurs dans le combo"""
-        users = self.api_client.get_users()
+        users = self.api_client.get_users_summary()
         
         # Conserver la sélection actuelle si possible
         current_user_id = None
@@ -358,7 +361,7 @@ class ItemsTab(QWidget):
     
     def refresh_items(self):
         """Actualise la liste des articles"""
-        items = self.api_client.get_items()
+        items = self.api_client.get_items(fields=self.TABLE_FIELDS)
         
         if isinstance(items, dict) and "error" in items:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement: {items['error']}")
@@ -413,16 +416,47 @@ class ItemsTab(QWidget):
         self.items_table.setRowCount(len(items))
         
         for row, item in enumerate(items):
-            self.items_table.setItem(row, 0, QTableWidgetItem(str(item['id'])))
-            self.items_table.setItem(row, 1, QTableWidgetItem(item['title']))
-            self.items_table.setItem(row, 2, QTableWidgetItem(item['description'][:50] + "..."))
-            self.items_table.setItem(row, 3, QTableWidgetItem(self.api_client.format_price(item['price'])))
-            self.items_table.setItem(row, 4, QTableWidgetItem("Oui" if item['is_available'] else "Non"))
-            self.items_table.setItem(row, 5, QTableWidgetItem(f"ID: {item['owner_id']}"))
+            self._set_item_row(row, item)
         
         # Ajuster la taille des colonnes
         self.items_table.resizeColumnsToContents()
     
+    def _set_item_row(self, row: int, item: Dict):
+        """Affiche un article sur une ligne de la table"""
+        self.items_table.setItem(row, 0, QTableWidgetItem(str(item['id'])))
+        self.items_table.setItem(row, 1, QTableWidgetItem(item['title']))
+        self.items_table.setItem(row, 2, QTableWidgetItem((item['description'] or "")[:50] + "..."))
+        self.items_table.setItem(row, 3, QTableWidgetItem(self.api_client.format_price(item['price'])))
+        self.items_table.setItem(row, 4, QTableWidgetItem("Oui" if item['is_available'] else "Non"))
+        self.items_table.setItem(row, 5, QTableWidgetItem(f"ID: {item['owner_id']}"))
+    
+    def _find_item_row(self, item_id: int) -> int:
+        """Retourne la ligne affichant l'article, ou -1"""
+        for row in range(self.items_table.rowCount()):
+            cell = self.items_table.item(row, 0)
+            if cell is not None and cell.text() == str(item_id):
+                return row
+        return -1
+    
+    def apply_item_change(self, change: Dict):
+        """Met à jour uniquement la ligne concernée par un changement poussé par l'API"""
+        row = self._find_item_row(change['row_id'])
+        if change['op'] == "delete":
+            if row >= 0:
+                self.items_table.removeRow(row)
+            return
+        
+        # En mode recherche, seuls les articles déjà affichés sont mis à jour
+        if row < 0 and self.search_input.text().strip():
+            return
+        item = self.api_client.get_item(change['row_id'], fields=self.TABLE_FIELDS)
+        if "error" in item:
+            return
+        if row < 0:
+            row = self.items_table.rowCount()
+            self.items_table.insertRow(row)
+        self._set_item_row(row, item)
+    
     def on_item_selected(self):
         """Appelé quand un article est sélectionné"""
         selected = self.items_table.selectionModel().hasSelection()
@@ -453,9 +487,69 @@ class ItemsTab(QWidget):
                 self.refresh_items()
 
 
+class ChangeListener(QThread):
+    """Écoute les changements poussés par l'API (Server-Sent Events) dans un thread séparé"""
+    
+    change_received = Signal(dict)
+    resync_required = Signal()
+    
+    RETRY_DELAY_MS = 5000
+    
+    def __init__(self, api_client: FastAPIClient):
+        super().__init__()
+        self.api_client = api_client
+        self.last_event_id = None
+        self._running = True
+        self._response = None
+    
+    def run(self):
+        """Reste connecté au flux ; reprend après le dernier événement reçu en cas de coupure"""
+        while self._running:
+            try:
+                for name, data in self.api_client.iter_events(self.last_event_id, on_connect=self._set_response):
+                    if not self._running:
+                        return
+                    if name == "change":
+                        self.last_event_id = data['id']
+                        self.change_received.emit(data)
+                    elif name == "resync":
+                        self.last_event_id = data['last_id']
+                        self.resync_required.emit()
+            except Exception:
+                pass
+            finally:
+                self._response = None
+            # API indisponible : nouvel essai plus tard, par pas courts pour s'arrêter vite
+            for _ in range(self.RETRY_DELAY_MS // 100):
+                if not self._running:
+                    return
+                self.msleep(100)
+    
+    def _set_response(self, response):
+        self._response = response
+        if not self._running:
+            # stop() appelé pendant la connexion
+            FastAPIClient.close_stream(response)
+    
+    def stop(self):
+        """Arrête l'écoute : la connexion en cours est coupée pour débloquer la lecture"""
+        self._running = False
+        response = self._response
+        if response is not None:
+            try:
+                FastAPIClient.close_stream(response)
+            except Exception:
+                pass
+
+
 class MainWindow(QMainWindow):
     """Fenêtre principale de l'application"""
     
+    # Délai de regroupement des changements poussés ; au-delà de MAX_ROW_UPDATES
+    # articles modifiés, la liste est rechargée en une fois
+    CHANGES_DELAY_MS = 200
+    MAX_ROW_UPDATES = 20
+    
     def __init__(self):
         super().__init__()
         self.api_client = FastAPIClient()
@@ -551,6 +645,68 @@ class MainWindow(QMainWindow):
         # Connecter les onglets à la fenêtre principale pour synchronisation
         self.users_tab.parent_window = self
         self.items_tab.parent_window = self
+        
+        # Changements faits par les autres clients, poussés par l'API et appliqués par rafale
+        self.pending_changes = {}
+        self.pending_users_refresh = self.pending_users_combo_refresh = False
+        self.changes_timer = QTimer(self)
+        self.changes_timer.setSingleShot(True)
+        self.changes_timer.setInterval(self.CHANGES_DELAY_MS)
+        self.changes_timer.timeout.connect(self.flush_changes)
+        self.change_listener = ChangeListener(self.api_client)
+        self.change_listener.change_received.connect(self.apply_change)
+        self.change_listener.resync_required.connect(self.resync_all_data)
+        self.change_listener.start()
+    
+    def apply_change(self, change: Dict):
+        """
+        Met de côté un changement poussé par l'API
+        
+        Les changements sont appliqués par rafale (flush_changes) : une création
+        en lot de 50 articles ne recharge la liste des utilisateurs qu'une fois.
+        """
+        self.pending_changes[(change['table'], change['row_id'])] = change
+        if change['table'] == "users":
+            self.pending_users_refresh = self.pending_users_combo_refresh = True
+        elif change['op'] != "update":
+            # Le nombre d'articles des utilisateurs a pu changer
+            self.pending_users_refresh = True
+        if not self.changes_timer.isActive():
+            self.changes_timer.start()
+    
+    def flush_changes(self):
+        """Applique les changements reçus depuis le dernier passage"""
+        changes = list(self.pending_changes.values())
+        item_changes = [change for change in changes if change['table'] == "items"]
+        refresh_users, refresh_combo = self.pending_users_refresh, self.pending_users_combo_refresh
+        self.pending_changes.clear()
+        self.pending_users_refresh = self.pending_users_combo_refresh = False
+        
+        if len(item_changes) > self.MAX_ROW_UPDATES:
+            self.items_tab.refresh_items()
+        else:
+            for change in item_changes:
+                self.items_tab.apply_item_change(change)
+        if refresh_users:
+            self.users_tab.refresh_users()
+        if refresh_combo:
+            self.items_tab.refresh_users_combo()
+    
+    def resync_all_data(self):
+        """Recharge toutes les listes (changements manqués par le client)"""
+        self.changes_timer.stop()
+        self.pending_changes.clear()
+        self.pending_users_refresh = self.pending_users_combo_refresh = False
+        self.users_tab.refresh_users()
+        self.items_tab.refresh_items()
+        self.items_tab.refresh_users_combo()
+    
+    def closeEvent(self, event):
+        """Arrête l'écoute des changements et attend la fin du thread avant la fermeture"""
+        self.changes_timer.stop()
+        self.change_listener.stop()
+        self.change_listener.wait(3000)
+        super().closeEvent(event)
     
     def refresh_all_users_data(self):
         """Met à jour toutes les données utilisateur dans tous les onglets"""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la compression des réponses : taille transférée et latence
+Usage: python scripts/benchmark_compression.py [--sizes 1,10,50,200] [--requests 50] [--bandwidth-mbps 10] [--rtt-ms 30]
+
+L'API est démarrée avec uvicorn sur une base SQLite temporaire, peuplée
+d'utilisateurs ayant chacun ITEMS_PER_USER articles avec description, puis
+GET /users/?limit=N est mesuré pour chaque encodage (identity, gzip, et br
+si le module brotli est installé).
+
+La latence mesurée est celle de la boucle locale ; la colonne "lien" estime
+le temps de réponse sur une liaison lente (VPN) : latence + RTT + transfert
+des octets compressés au débit donné.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+
+import httpx
+
+from load_test import find_free_port, start_api
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from business.services.compression import available_encodings  # noqa: E402
+
+ITEMS_PER_USER = 10
+
+
+def seed(base_url: str, users: int):
+    """Peuple la base via les endpoints de création en lot"""
+    rows = [{"email": f"compression{i}@example.com", "nom": "Compression", "prenom": str(i)} for i in range(users)]
+    httpx.post(f"{base_url}/users/bulk", json=rows, timeout=60).raise_for_status()
+    for user_id in range(1, users + 1):
+        items = [{"title": f"Article {user_id}-{j}",
+                  "description": f"Description détaillée de l'article {j}, livré sous 48 heures. " * 3,
+                  "price": 100 * j}
+                 for j in range(ITEMS_PER_USER)]
+        httpx.post(f"{base_url}/users/{user_id}/items/bulk", json=items, timeout=60).raise_for_status()
+
+
+def measure(client: httpx.Client, url: str, encoding: str, count: int):
+    """Retourne (octets transférés, latence médiane en secondes)"""
+    headers = {"Accept-Encoding": encoding}
+    response = client.get(url, headers=headers)
+    response.raise_for_status()
+    expected = response.headers.get("content-encoding", "identity")
+    if expected != encoding:
+        raise RuntimeError(f"Encodage {encoding} demandé, {expected} reçu")
+    latencies = []
+    for _ in range(count):
+        response = client.get(url, headers=headers)
+        latencies.append(response.elapsed.total_seconds())
+    return response.num_bytes_downloaded, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la compression gzip/brotli")
+    parser.add_argument('--sizes', default='1,10,50,200', help="Nombres d'utilisateurs par page")
+    parser.add_argument('--requests', type=int, default=50, help='Requêtes par mesure')
+    parser.add_argument('--bandwidth-mbps', type=float, default=10, help='Débit du lien simulé (Mbit/s)')
+    parser.add_argument('--rtt-ms', type=float, default=30, help='Aller-retour du lien simulé (ms)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    encodings = ["identity", *reversed(available_encodings(("br", "gzip")))]
+
+    with tempfile.TemporaryDirectory() as directory:
+        port = find_free_port()
+        process = start_api(port, f"sqlite:///{os.path.join(directory, 'compression.db')}", use_async=False)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            seed(base_url, max(sizes))
+            print(f"📦 GET /users/?limit=N ({ITEMS_PER_USER} articles par utilisateur), "
+                  f"lien simulé {args.bandwidth_mbps:g} Mbit/s, RTT {args.rtt_ms:g} ms")
+            print("=" * 74)
+            print(f"{'N':>5} {'Encodage':<10} {'Octets':>10} {'Ratio':>7} {'Latence (ms)':>13} {'Lien (ms)':>11}")
+            with httpx.Client(base_url=base_url, timeout=60) as client:
+                for size in sizes:
+                    identity_bytes = None
+                    for encoding in encodings:
+                        size_bytes, latency = measure(client, f"/users/?limit={size}", encoding, args.requests)
+                        identity_bytes = identity_bytes or size_bytes
+                        link = latency + args.rtt_ms / 1000 + size_bytes * 8 / (args.bandwidth_mbps * 1e6)
+                        print(f"{size:>5} {encoding:<10} {size_bytes:>10,} {identity_bytes / size_bytes:>6.1f}x "
+                              f"{latency * 1000:>13.2f} {link * 1000:>11.1f}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la sérialisation de GET /items/?limit=100
+Usage: python scripts/benchmark_serialization.py [--requests 1000] [--limit 100]
+
+Compare, sur une base SQLite fichier temporaire et dans le processus
+(TestClient, sans réseau) :
+- "orm"          : l'ancien chemin, objets ORM validés par response_model ;
+- "orm+orjson"   : le même avec response_class=ORJSONResponse ;
+- "rows"         : GET /items/, tuples SQL convertis en dicts, validés une fois
+                   puis encodés par pydantic-core (JSON_ENCODER=pydantic) ;
+- "rows+orjson"  : GET /items/ avec JSON_ENCODER=orjson.
+La colonne "sérialisation" mesure la conversion seule (sans requête SQL ni HTTP).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(fn, count: int):
+    """Exécute fn count fois (après un échauffement) et retourne les latences (secondes)"""
+    for _ in range(10):
+        fn()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la sérialisation JSON des listes")
+    parser.add_argument('--requests', type=int, default=1000, help='Nombre de requêtes par chemin')
+    parser.add_argument('--limit', type=int, default=100, help='Articles par page')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # La base doit être choisie avant l'import de l'API
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        os.environ["DB_ASYNC"] = "false"
+
+        from fastapi import Depends
+        from fastapi.testclient import TestClient
+
+        from business.api.main import app, get_db
+        from business.services import projection, serialization
+        from business.validation import schemas
+        from database.config.database import SessionLocal, engine
+        from database.repository import crud
+
+        with SessionLocal() as db:
+            user_id = crud.create_user(db, schemas.UserCreate(email="bench@example.com", nom="Bench", prenom="Mark")).id
+            items = [schemas.ItemCreate(title=f"Article {i}", description="Description " * 10, price=i)
+                     for i in range(args.limit)]
+            crud.create_user_items_bulk(db, items, user_id)
+
+        @app.get("/bench/items-orm", response_model=List[schemas.Item])
+        def read_items_orm(limit: int = 100, db=Depends(get_db)):
+            return crud.get_items(db, limit=limit)
+
+        @app.get("/bench/items-orm-orjson", response_model=List[schemas.Item],
+                 response_class=serialization.ORJSONResponse)
+        def read_items_orm_orjson(limit: int = 100, db=Depends(get_db)):
+            return crud.get_items(db, limit=limit)
+
+        paths = {
+            "orm": ("pydantic", f"/bench/items-orm?limit={args.limit}"),
+            "orm+orjson": ("pydantic", f"/bench/items-orm-orjson?limit={args.limit}"),
+            "rows": ("pydantic", f"/items/?limit={args.limit}"),
+            "rows+orjson": ("orjson", f"/items/?limit={args.limit}"),
+        }
+        with SessionLocal() as db:
+            orm_items, rows = crud.get_items(db, limit=args.limit), crud.get_item_rows(db, limit=args.limit)
+            adapter = projection.adapters(projection.item_schema(None))[1]
+            serializers = {
+                "orm": lambda: adapter.dump_json(adapter.validate_python(orm_items, from_attributes=True)),
+                "orm+orjson": lambda: serialization.orjson_dumps(
+                    adapter.dump_python(adapter.validate_python(orm_items, from_attributes=True), mode="json")),
+                "rows": lambda: serialization.dump_json(adapter, rows, "pydantic"),
+                "rows+orjson": lambda: serialization.dump_json(adapter, rows, "orjson"),
+            }
+
+        print(f"⏱️  GET /items/?limit={args.limit} : {args.requests} requêtes par chemin")
+        print("=" * 72)
+        print(f"{'Chemin':<12} {'Moyenne (µs)':>13} {'p50 (µs)':>10} {'p95 (µs)':>10} {'Sérialisation (µs)':>20}")
+        with TestClient(app) as client:
+            for path, (encoder, url) in paths.items():
+                serialization.JSON_ENCODER = encoder
+                assert len(client.get(url).json()) == args.limit
+                latencies = measure(lambda: client.get(url), args.requests)
+                serialize = measure(serializers[path], args.requests)
+                p95 = latencies[int(len(latencies) * 0.95)]
+                print(f"{path:<12} {statistics.mean(latencies) * 1e6:>13,.0f} "
+                      f"{statistics.median(latencies) * 1e6:>10,.0f} {p95 * 1e6:>10,.0f} "
+                      f"{statistics.median(serialize) * 1e6:>20,.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark du débit d'écriture selon le profil SQLite (database/config/database.py)
+Usage: python scripts/benchmark_sqlite_profiles.py [--writes 2000] [--threads 8]
+
+Chaque écriture reproduit POST /users/{id}/items/ : une session, un INSERT,
+un commit. Les écritures sont réparties sur plusieurs threads comme dans le
+pool de threads d'uvicorn, sur une base fichier temporaire par profil.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from business.validation import schemas
+from database.config.database import SQLITE_PROFILES, configure_sqlite
+from database.models import models
+from database.repository import crud
+
+
+def run_profile(profile: str, writes: int, threads: int):
+    """Exécute les écritures avec un profil et retourne (durée, écritures réussies, erreurs de verrou)"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = configure_sqlite(create_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+            pool_size=threads,
+        ), profile)
+        models.Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with SessionLocal() as db:
+            user_id = crud.create_user(db, schemas.UserCreate(email="bench@example.com", nom="Bench", prenom="Mark")).id
+
+        def write(i):
+            with SessionLocal() as db:
+                try:
+                    crud.create_user_item(db, schemas.ItemCreate(title=f"Article {i}", price=i), user_id)
+                    return True
+                except OperationalError:
+                    return False
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(write, range(writes)))
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+
+    succeeded = sum(results)
+    return elapsed, succeeded, writes - succeeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des profils SQLite")
+    parser.add_argument('--writes', type=int, default=2000, help="Nombre d'écritures par profil")
+    parser.add_argument('--threads', type=int, default=8, help="Nombre de threads écrivains")
+    args = parser.parse_args()
+
+    print(f"⏱️  {args.writes} écritures (INSERT + COMMIT) sur {args.threads} threads")
+    print("=" * 60)
+    print(f"{'Profil':<12} {'Durée':>9} {'Écritures/s':>13} {'database is locked':>20}")
+    for profile in SQLITE_PROFILES:
+        elapsed, succeeded, locked = run_profile(profile, args.writes, args.threads)
+        print(f"{profile:<12} {elapsed:>8.2f}s {succeeded / elapsed:>13,.0f} {locked:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la latence des mises à jour (PUT /items/{id} et PUT /users/{id})
+Usage: python scripts/benchmark_updates.py [--updates 2000] [--items-per-user 20]
+
+Compare, sur une base SQLite fichier temporaire (profil production) :
+- "orm"       : l'ancien chemin SELECT, setattr, COMMIT, refresh() (+ chargement
+                paresseux des articles pour la réponse utilisateur) ;
+- "returning" : crud.update_item / crud.update_user, un seul UPDATE ... RETURNING.
+Les deux chemins tiennent à jour les versions et le journal des changements.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+from business.validation import schemas
+from database.config.database import create_database_engine
+from database.models import models
+from database.repository import crud
+
+
+def orm_update(db, model, table_name, row_id, data, schema):
+    """Ancien chemin : lecture, modification des attributs, commit puis relecture"""
+    db_row = db.query(model).filter(model.id == row_id).first()
+    for field, value in data.model_dump(exclude_unset=True).items():
+        setattr(db_row, field, value)
+    crud._bump_versions(db, table_name)
+    crud._log_changes(db, table_name, "update", [row_id])
+    db.commit()
+    db.refresh(db_row)
+    return schema.model_validate(db_row)
+
+
+def measure(update, updates: int):
+    """Exécute les mises à jour et retourne les latences (secondes)"""
+    latencies = []
+    for i in range(updates):
+        start = time.perf_counter()
+        update(i)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UPDATE ... RETURNING")
+    parser.add_argument('--updates', type=int, default=2000, help='Nombre de mises à jour par chemin')
+    parser.add_argument('--items-per-user', type=int, default=20, help="Articles de l'utilisateur modifié")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_database_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with SessionLocal() as db:
+            user_id = crud.create_user(db, schemas.UserCreate(email="bench@example.com", nom="Bench", prenom="Mark")).id
+            items = [schemas.ItemCreate(title=f"Article {i}", price=i) for i in range(args.items_per_user)]
+            item_id = crud.create_user_items_bulk(db, items, user_id)[0].id
+
+        paths = {
+            "orm": {
+                "PUT /items/{id}": lambda db, i: orm_update(
+                    db, models.Item, "items", item_id, schemas.ItemUpdate(price=i), schemas.Item),
+                "PUT /users/{id}": lambda db, i: orm_update(
+                    db, models.User, "users", user_id, schemas.UserUpdate(nom=f"Nom {i}"), schemas.User),
+            },
+            "returning": {
+                "PUT /items/{id}": lambda db, i: schemas.Item.model_validate(
+                    crud.update_item(db, item_id, schemas.ItemUpdate(price=i))),
+                "PUT /users/{id}": lambda db, i: schemas.User.model_validate(
+                    crud.update_user(db, user_id, schemas.UserUpdate(nom=f"Nom {i}"))),
+            },
+        }
+
+        print(f"⏱️  {args.updates} mises à jour par chemin (utilisateur avec {args.items_per_user} articles)")
+        print("=" * 64)
+        print(f"{'Endpoint':<17} {'Chemin':<10} {'Moyenne (µs)':>13} {'p50 (µs)':>10} {'p95 (µs)':>10}")
+        for endpoint in ("PUT /items/{id}", "PUT /users/{id}"):
+            for path, updates in paths.items():
+                with SessionLocal() as db:
+                    latencies = sorted(measure(lambda i: updates[endpoint](db, i), args.updates))
+                p95 = latencies[int(len(latencies) * 0.95)]
+                print(f"{endpoint:<17} {path:<10} {statistics.mean(latencies) * 1e6:>13,.0f} "
+                      f"{statistics.median(latencies) * 1e6:>10,.0f} {p95 * 1e6:>10,.0f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test de charge : débit de l'API en mode synchrone et asynchrone (DB_ASYNC)
+Usage: python scripts/load_test.py [--clients 200] [--duration 10] [--modes sync,async]
+
+Pour chaque mode, l'API est démarrée avec uvicorn sur une base SQLite
+temporaire, peuplée, puis sollicitée par N clients concurrents qui
+enchaînent GET /users/{id} et GET /items/?limit=20.
+Nécessite httpx (et aiosqlite pour le mode asynchrone).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+USERS = 100
+ITEMS_PER_USER = 20
+
+
+def find_free_port():
+    """Trouve un port libre sur la machine"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_api(port: int, database_url: str, use_async: bool):
+    """Démarre l'API dans un sous-processus et attend qu'elle réponde"""
+    env = {**os.environ, "DATABASE_URL": database_url, "DB_ASYNC": "true" if use_async else "false"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "business.api.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("L'API n'a pas démarré")
+
+
+def seed(base_url: str):
+    """Peuple la base via les endpoints de création en lot"""
+    users = [{"email": f"charge{i}@example.com", "nom": "Charge", "prenom": str(i)} for i in range(USERS)]
+    httpx.post(f"{base_url}/users/bulk", json=users, timeout=30).raise_for_status()
+    for user_id in range(1, USERS + 1):
+        items = [{"title": f"Article {user_id}-{j}", "description": "Description " * 5, "price": j}
+                 for j in range(ITEMS_PER_USER)]
+        httpx.post(f"{base_url}/users/{user_id}/items/bulk", json=items, timeout=30).raise_for_status()
+
+
+async def client_loop(client: httpx.AsyncClient, deadline: float, latencies: list, errors: list):
+    """Enchaîne les requêtes jusqu'à l'échéance"""
+    while time.perf_counter() < deadline:
+        if random.random() < 0.5:
+            url = f"/users/{random.randint(1, USERS)}"
+        else:
+            url = "/items/?limit=20"
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(base_url: str, clients: int, duration: float):
+    """Lance les clients concurrents et retourne (requêtes/s, p50, p95, erreurs)"""
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(client_loop(client, deadline, latencies, errors) for _ in range(clients)))
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return len(latencies) / duration, statistics.median(latencies or [0]), p95, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge sync/async de l'API")
+    parser.add_argument('--clients', type=int, default=200, help='Nombre de clients concurrents')
+    parser.add_argument('--duration', type=float, default=10, help='Durée de la mesure (secondes)')
+    parser.add_argument('--modes', default='sync,async', help='Modes à mesurer (sync,async)')
+    args = parser.parse_args()
+
+    print(f"🔥 {args.clients} clients concurrents pendant {args.duration:.0f}s par mode")
+    print("=" * 60)
+    print(f"{'Mode':<8} {'Requêtes/s':>12} {'p50 (ms)':>10} {'p95 (ms)':>10} {'Erreurs':>9}")
+    for mode in args.modes.split(","):
+        with tempfile.TemporaryDirectory() as directory:
+            port = find_free_port()
+            process = start_api(port, f"sqlite:///{os.path.join(directory, 'charge.db')}", mode == "async")
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                seed(base_url)
+                rps, p50, p95, errors = asyncio.run(run_load(base_url, args.clients, args.duration))
+            finally:
+                process.terminate()
+                process.wait()
+        print(f"{mode:<8} {rps:>12,.0f} {p50 * 1000:>10.1f} {p95 * 1000:>10.1f} {errors:>9}")
+
+
+if __name__ == "__main__":
+    main()
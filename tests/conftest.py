@@ -0,0 +1,72 @@
+"""
+Fixtures partagées pour les tests automatisés (pytest)
+Chaque test utilise une base SQLite en mémoire isolée.
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.config.database import configure_sqlite
+from database.models import models
+from database.repository import search_index
+from business.api.main import app, get_db, get_sync_db
+from business.services.cache import entity_cache, stats_cache
+
+
+@pytest.fixture
+def engine():
+    """Moteur SQLite en mémoire partagé par toutes les connexions du test"""
+    test_engine = configure_sqlite(create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    ), "production")
+    models.Base.metadata.create_all(bind=test_engine)
+    search_index.setup_search_index(test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Fabrique de sessions liée au moteur de test"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    """Session de base de données pour les tests du repository"""
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    """Client HTTP de test branché sur la base en mémoire"""
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_sync_db] = override_get_db
+    # Les IDs repartent de 1 dans chaque base de test
+    entity_cache.clear()
+    stats_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
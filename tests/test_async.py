@@ -0,0 +1,69 @@
+"""
+Tests des endpoints CRUD avec une AsyncSession (DB_ASYNC)
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from business.api.main import app, get_db
+from database.config.database import configure_sqlite, create_async_database_engine
+from database.models import models
+from database.repository import search_index
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+
+@pytest.fixture
+def async_client(client, tmp_path):
+    """Client de test dont les endpoints CRUD reçoivent une AsyncSession (aiosqlite)"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = configure_sqlite(create_engine(url))
+    models.Base.metadata.create_all(bind=sync_engine)
+    search_index.setup_search_index(sync_engine)
+    sync_engine.dispose()
+
+    async_engine = create_async_database_engine(url)
+    search_index.mark_enabled(async_engine.sync_engine)
+    AsyncTestingSession = async_sessionmaker(autoflush=False, bind=async_engine)
+
+    async def override_get_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield client
+    client.portal.call(async_engine.dispose)
+
+
+def test_async_url_uses_async_driver():
+    async_engine = create_async_database_engine("sqlite:///./inutilise.db")
+    assert async_engine.url.drivername == "sqlite+aiosqlite"
+
+
+def test_crud_with_async_session(async_client):
+    user = async_client.post("/users/", json={"email": "async@example.com", "nom": "Async", "prenom": "IO"})
+    assert user.status_code == 200
+    assert user.json()["items"] == []
+    user_id = user.json()["id"]
+
+    item = async_client.post(f"/users/{user_id}/items/", json={"title": "Vélo cargo", "price": 250000})
+    assert item.status_code == 200
+    item_id = item.json()["id"]
+
+    assert async_client.get(f"/users/{user_id}").json()["items"][0]["id"] == item_id
+    assert async_client.get("/users/").json()[0]["items"][0]["title"] == "Vélo cargo"
+    assert async_client.get("/users/summary").json()[0]["items_count"] == 1
+    assert async_client.get("/items/", params={"cursor": ""}).json()["next_cursor"] is None
+    assert [i["id"] for i in async_client.get("/search/items", params={"q": "velo"}).json()] == [item_id]
+
+    updated = async_client.put(f"/users/{user_id}", json={"nom": "Asynchrone"})
+    assert updated.json()["nom"] == "Asynchrone"
+    assert len(updated.json()["items"]) == 1
+    assert async_client.put(f"/items/{item_id}", json={"price": 1}).json()["price"] == 1
+
+    deleted = async_client.delete(f"/users/{user_id}")
+    assert deleted.json()["articles_supprimés"] == 1
+    assert async_client.get(f"/items/{item_id}").status_code == 404
@@ -0,0 +1,56 @@
+"""
+Tests des créations en lot (POST /users/bulk, POST /users/{id}/items/bulk)
+"""
+
+from business.validation import schemas
+from database.repository import crud
+from infrastructure.diagnostics.query_counter import assert_max_queries
+
+
+def _user(i):
+    return {"email": f"bulk{i}@example.com", "nom": "Bulk", "prenom": f"U{i}"}
+
+
+def test_users_bulk_reports_row_errors(client, db):
+    crud.create_user(db, schemas.UserCreate(**_user(0)))
+
+    rows = [_user(0), _user(1), {"email": "incomplet@example.com"}, _user(2), _user(1)]
+    response = client.post("/users/bulk", json=rows)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert [user["email"] for user in result["created"]] == ["bulk1@example.com", "bulk2@example.com"]
+    assert all(user["items"] == [] for user in result["created"])
+    assert [error["index"] for error in result["errors"]] == [0, 2, 4]
+    assert "nom" in result["errors"][1]["detail"]
+
+
+def test_users_bulk_all_or_nothing(client):
+    rows = [_user(1), {"nom": "Sans email"}]
+    response = client.post("/users/bulk", params={"all_or_nothing": True}, json=rows)
+
+    assert response.status_code == 400
+    assert response.json()["detail"][0]["index"] == 1
+    assert client.get("/users/").json() == []
+
+
+def test_items_bulk_single_insert(client, engine, db):
+    user = crud.create_user(db, schemas.UserCreate(**_user(1)))
+    rows = [{"title": f"Article {i}", "price": i} for i in range(200)]
+    rows.append({"title": "Sans prix"})
+
+    # SELECT utilisateur + INSERT ... VALUES (...), (...) RETURNING
+    # + version de la table + journal des changements
+    with assert_max_queries(engine, 4):
+        response = client.post(f"/users/{user.id}/items/bulk", json=rows)
+
+    result = response.json()
+    assert len(result["created"]) == 200
+    assert result["created"][0]["owner_id"] == user.id
+    assert result["errors"][0]["index"] == 200
+    assert len(crud.get_items_by_user(db, user.id, limit=1000)) == 200
+
+
+def test_items_bulk_unknown_user(client):
+    response = client.post("/users/999/items/bulk", json=[{"title": "Article", "price": 1}])
+    assert response.status_code == 404
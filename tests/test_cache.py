@@ -0,0 +1,207 @@
+"""
+Tests du cache des lectures unitaires (GET /users/{id}, GET /items/{id})
+
+Le backend Redis est testé contre un serveur fakeredis local (ignoré si
+redis ou fakeredis ne sont pas installés).
+"""
+
+import threading
+import time
+
+import pytest
+
+from business.services import cache
+from business.services.cache import RedisCache, TTLCache
+from infrastructure.diagnostics.query_counter import count_queries
+
+
+@pytest.fixture
+def redis_url():
+    """Serveur Redis simulé écoutant sur un port local"""
+    pytest.importorskip("redis")
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def workers(redis_url):
+    """Deux caches Redis, comme deux workers uvicorn"""
+    import redis
+
+    caches = [RedisCache(redis.Redis.from_url(redis_url), ttl=30).start_listener() for _ in range(2)]
+    time.sleep(0.2)  # laisser les abonnements s'établir
+    yield caches
+    for worker_cache in caches:
+        worker_cache.close()
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def _create(client):
+    user = client.post("/users/", json={"email": "cache@example.com", "nom": "Cache", "prenom": "Test"}).json()
+    item = client.post(f"/users/{user['id']}/items/", json={"title": "Lampe", "price": 1200}).json()
+    return user["id"], item["id"]
+
+
+def test_second_read_is_served_from_cache(client, engine):
+    user_id, item_id = _create(client)
+    before = client.get("/cache/stats").json()
+    client.get(f"/users/{user_id}")
+    client.get(f"/items/{item_id}")
+
+    with count_queries(engine) as counter:
+        assert client.get(f"/users/{user_id}").json()["items"][0]["id"] == item_id
+        assert client.get(f"/items/{item_id}").json()["title"] == "Lampe"
+
+    assert counter.count == 0
+    stats = client.get("/cache/stats").json()
+    assert stats["hits"] - before["hits"] == 2
+    assert stats["misses"] - before["misses"] == 2
+
+
+def test_writes_invalidate_cached_entries(client):
+    user_id, item_id = _create(client)
+    client.get(f"/users/{user_id}")
+    client.get(f"/items/{item_id}")
+
+    client.put(f"/items/{item_id}", json={"price": 900})
+    assert client.get(f"/items/{item_id}").json()["price"] == 900
+    assert client.get(f"/users/{user_id}").json()["items"][0]["price"] == 900
+
+    client.post(f"/users/{user_id}/items/", json={"title": "Table", "price": 5000})
+    assert len(client.get(f"/users/{user_id}").json()["items"]) == 2
+
+    client.put(f"/users/{user_id}", json={"nom": "Modifié"})
+    assert client.get(f"/users/{user_id}").json()["nom"] == "Modifié"
+
+    client.delete(f"/items/{item_id}")
+    assert client.get(f"/items/{item_id}").status_code == 404
+    assert len(client.get(f"/users/{user_id}").json()["items"]) == 1
+
+
+def test_deleting_user_invalidates_its_items(client):
+    user_id, item_id = _create(client)
+    client.get(f"/items/{item_id}")
+
+    client.delete(f"/users/{user_id}")
+
+    assert client.get(f"/users/{user_id}").status_code == 404
+    assert client.get(f"/items/{item_id}").status_code == 404
+
+
+def test_ttl_and_lru():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11
+    assert cache.get("a") is None
+
+
+def test_fill_after_invalidation_is_ignored():
+    cache = TTLCache(maxsize=10, ttl=10)
+    version = cache.version
+    cache.invalidate(["a"])
+    cache.set("a", "périmé", version)
+    assert cache.get("a") is None
+
+
+def test_disabled_cache():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["enabled"] is False
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        cache.create_cache("memcached")
+
+
+def test_redis_backend_is_shared_between_workers(workers):
+    first, second = workers
+    first.set(cache.user_key(1), {"id": 1, "items": [{"id": 3}]})
+
+    assert second.get(cache.user_key(1)) == {"id": 1, "items": [{"id": 3}]}
+    assert second.local.get(cache.user_key(1)) is not None
+
+
+def test_redis_invalidation_reaches_other_workers(workers):
+    first, second = workers
+    first.set(cache.item_key(3), {"id": 3})
+    assert second.get(cache.item_key(3)) == {"id": 3}
+
+    first.invalidate([cache.item_key(3), cache.user_key(1)])
+
+    assert wait_until(lambda: second.local.get(cache.item_key(3)) is None)
+    assert second.get(cache.item_key(3)) is None
+
+    second.set(cache.user_key(2), {"id": 2})
+    second.clear()
+    assert wait_until(lambda: first.get(cache.user_key(2)) is None)
+
+
+def test_stale_fill_from_another_worker_is_ignored(redis_url):
+    """Lecture (A) → invalidation (B) → écriture (A) : Redis ne garde pas la valeur périmée
+
+    Sans écoute des invalidations : le message de B n'est jamais arrivé chez A,
+    seule la génération partagée dans Redis protège l'écriture.
+    """
+    import redis
+
+    first, second = (RedisCache(redis.Redis.from_url(redis_url), ttl=30) for _ in range(2))
+    key = cache.item_key(3)
+    generation = first.generation(key)
+
+    second.invalidate([key])
+    first.set(key, {"id": 3, "title": "périmé"}, generation)
+
+    assert second.get(key) is None
+    assert first.get(key) is None
+    # Une lecture commencée après l'invalidation remplit le cache normalement
+    first.set(key, {"id": 3, "title": "à jour"}, first.generation(key))
+    assert second.get(key) == {"id": 3, "title": "à jour"}
+
+
+def test_stale_fill_after_clear_is_ignored(redis_url):
+    import redis
+
+    first, second = (RedisCache(redis.Redis.from_url(redis_url), ttl=30) for _ in range(2))
+    generation = first.generation(cache.user_key(1))
+
+    second.clear()
+    first.set(cache.user_key(1), {"id": 1}, generation)
+
+    assert second.get(cache.user_key(1)) is None
+
+
+def test_api_with_redis_backend(client, workers, monkeypatch):
+    first, second = workers
+    monkeypatch.setattr(cache, "entity_cache", first)
+    user_id, item_id = _create(client)
+    client.get(f"/users/{user_id}")
+    assert second.get(cache.user_key(user_id))["items"][0]["title"] == "Lampe"
+
+    client.put(f"/items/{item_id}", json={"title": "Lampe de bureau"})
+
+    assert wait_until(lambda: second.get(cache.user_key(user_id)) is None)
+    monkeypatch.setattr(cache, "entity_cache", second)
+    assert client.get(f"/users/{user_id}").json()["items"][0]["title"] == "Lampe de bureau"
+    assert client.get("/cache/stats").json()["backend"] == "redis"
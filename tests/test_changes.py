@@ -0,0 +1,65 @@
+"""
+Tests du journal des changements (GET /items/changes, GET /users/changes)
+"""
+
+from infrastructure.diagnostics.query_counter import count_queries
+
+
+def _changes(client, path, since=""):
+    return client.get(path, params={"since": since}).json()
+
+
+def test_item_feed_lists_inserts_updates_and_deletes(client):
+    user = client.post("/users/", json={"email": "c@example.com", "nom": "C", "prenom": "Test"}).json()
+    lamp = client.post(f"/users/{user['id']}/items/", json={"title": "Lampe", "price": 1000}).json()
+    client.post(f"/users/{user['id']}/items/bulk", json=[{"title": "Table", "price": 5000}])
+    client.put(f"/items/{lamp['id']}", json={"price": 900})
+    client.delete(f"/items/{lamp['id']}")
+
+    page = _changes(client, "/items/changes")
+
+    assert [(c["operation"], c["row_id"]) for c in page["changes"]] == [
+        ("insert", lamp["id"]), ("insert", lamp["id"] + 1), ("update", lamp["id"]), ("delete", lamp["id"]),
+    ]
+    assert page["changes"][0]["data"] is None  # supprimé depuis
+    assert page["changes"][1]["data"]["title"] == "Table"
+    assert page["has_more"] is False
+
+
+def test_cursor_returns_only_new_changes(client):
+    user = client.post("/users/", json={"email": "c@example.com", "nom": "C", "prenom": "Test"}).json()
+    cursor = _changes(client, "/items/changes")["next_cursor"]
+    assert _changes(client, "/items/changes", cursor) == {"changes": [], "next_cursor": cursor, "has_more": False}
+
+    client.post(f"/users/{user['id']}/items/", json={"title": "Lampe", "price": 1000})
+    page = _changes(client, "/items/changes", cursor)
+    assert [c["operation"] for c in page["changes"]] == ["insert"]
+    assert page["next_cursor"] != cursor
+
+
+def test_user_delete_logs_its_items(client):
+    user = client.post("/users/", json={"email": "c@example.com", "nom": "C", "prenom": "Test"}).json()
+    client.post(f"/users/{user['id']}/items/bulk", json=[{"title": "A", "price": 1}, {"title": "B", "price": 2}])
+    cursor = _changes(client, "/items/changes")["next_cursor"]
+
+    client.delete(f"/users/{user['id']}")
+
+    assert [c["operation"] for c in _changes(client, "/items/changes", cursor)["changes"]] == ["delete", "delete"]
+    assert [c["operation"] for c in _changes(client, "/users/changes")["changes"]] == ["insert", "delete"]
+
+
+def test_paging_and_constant_queries(client, engine):
+    user = client.post("/users/", json={"email": "c@example.com", "nom": "C", "prenom": "Test"}).json()
+    client.post(f"/users/{user['id']}/items/bulk", json=[{"title": f"A{i}", "price": i} for i in range(5)])
+
+    with count_queries(engine) as counter:
+        page = client.get("/items/changes", params={"limit": 3}).json()
+    assert counter.count == 1
+    assert len(page["changes"]) == 3 and page["has_more"] is True
+
+    rest = _changes(client, "/items/changes", page["next_cursor"])
+    assert len(rest["changes"]) == 2 and rest["has_more"] is False
+
+
+def test_invalid_cursor(client):
+    assert client.get("/items/changes", params={"since": "!!"}).status_code == 400
@@ -0,0 +1,156 @@
+"""
+Tests de la compression des réponses (gzip, brotli) et du décodage côté client
+"""
+
+import gzip
+import io
+import json
+
+import pytest
+import requests
+import urllib3
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from business.services import compression
+from business.services.compression import CompressionMiddleware, negotiate_encoding
+from business.validation import schemas
+from database.repository import crud
+from presentation.gui.api_client import FastAPIClient
+
+
+class RawASGIAdapter(requests.adapters.HTTPAdapter):
+    """Adaptateur requests qui transmet au TestClient et rend le corps brut (encore compressé)"""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def send(self, request, **kwargs):
+        with self.client.stream(request.method, request.url, headers=dict(request.headers),
+                                content=request.body) as response:
+            raw = b"".join(response.iter_raw())
+        headers = urllib3.HTTPHeaderDict()
+        for name, value in response.headers.multi_items():
+            headers.add(name, value)
+        return self.build_response(request, urllib3.HTTPResponse(
+            body=io.BytesIO(raw), headers=headers, status=response.status_code,
+            preload_content=False, decode_content=True,
+        ))
+
+
+def _seed(db, items=50):
+    user = crud.create_user(db, schemas.UserCreate(email="gzip@example.com", nom="Gzip", prenom="Test"))
+    crud.create_user_items_bulk(
+        db, [schemas.ItemCreate(title=f"Article {i}", description="Description répétitive " * 5, price=i)
+             for i in range(items)],
+        user.id,
+    )
+
+
+def _raw_get(client, url, accept_encoding):
+    with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_gzipped(client, db):
+    _seed(db)
+    plain, plain_body = _raw_get(client, "/users/", "identity")
+
+    response, body = _raw_get(client, "/users/", "gzip, deflate")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(body) < len(plain_body) / 5
+    assert gzip.decompress(body) == plain_body
+    assert "content-encoding" not in plain.headers
+
+
+def test_small_responses_are_not_compressed(client):
+    response, body = _raw_get(client, "/", "gzip")
+
+    assert "content-encoding" not in response.headers
+    assert json.loads(body)["docs"] == "/docs"
+
+
+def test_etag_is_shared_by_encodings(client, db):
+    """L'ETag est calculé avant la compression : un 304 reste possible en gzip"""
+    _seed(db)
+    etag = client.get("/items/", headers={"Accept-Encoding": "identity"}).headers["etag"]
+
+    response = client.get("/items/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert client.get("/items/", headers={"Accept-Encoding": "gzip"}).headers["etag"] == etag
+
+
+def test_stream_is_compressed_by_chunks(client, db):
+    _seed(db, items=1200)
+    plain = client.get("/export/items.ndjson", headers={"Accept-Encoding": "identity"}).content
+
+    response, body = _raw_get(client, "/export/items.ndjson", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body) == plain
+
+
+def test_event_stream_is_never_compressed():
+    async def events(request):
+        return StreamingResponse(iter(["data: x\n\n" * 500]), media_type="text/event-stream")
+
+    app = CompressionMiddleware(Starlette(routes=[Route("/events", events)]), minimum_size=10)
+    with TestClient(app) as client:
+        response, body = _raw_get(client, "/events", "gzip")
+
+    assert "content-encoding" not in response.headers
+    assert body.startswith(b"data: x")
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate, br", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.8", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("*", ("br", "gzip")) == "br"
+    assert negotiate_encoding("gzip;q=0, *;q=0.1", ("gzip",)) is None
+    assert negotiate_encoding("", ("br", "gzip")) is None
+    assert negotiate_encoding("identity", ("br", "gzip")) is None
+
+
+def test_brotli_is_optional(monkeypatch):
+    monkeypatch.setattr(compression, "brotli_available", lambda: False)
+    assert compression.available_encodings(("br", "gzip")) == ("gzip",)
+    with pytest.raises(ValueError):
+        compression.available_encodings(("zstd",))
+
+
+def test_brotli_encoding(client, db):
+    brotli = pytest.importorskip("brotli")
+    _seed(db)
+    plain = client.get("/users/", headers={"Accept-Encoding": "identity"}).content
+
+    response, body = _raw_get(client, "/users/", "br, gzip")
+
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(body) == plain
+
+
+def test_gui_client_decodes_compressed_responses(client, db):
+    """FastAPIClient annonce les encodages qu'il sait décoder et reçoit des données décodées"""
+    _seed(db)
+    api = FastAPIClient("http://testserver")
+    api.session.mount("http://testserver", RawASGIAdapter(client))
+
+    # gzip toujours, br si urllib3 dispose de brotli
+    accept_encoding = api.session.headers["Accept-Encoding"]
+    assert "gzip" in accept_encoding
+    expected = negotiate_encoding(accept_encoding, compression.available_encodings())
+    assert api.session.get("http://testserver/users/").headers["content-encoding"] == expected
+    users = api.get_users()
+    assert users[0]["email"] == "gzip@example.com"
+    assert len(users[0]["items"]) == 50
+    assert api.get_users() == users
+    assert api.last_not_modified is True
@@ -0,0 +1,107 @@
+"""
+Tests des ETag et des réponses 304 (If-None-Match), côté API et côté client
+"""
+
+import requests
+
+from business.services.etag import etag_matches
+from presentation.gui.api_client import FastAPIClient
+
+
+class ASGIAdapter(requests.adapters.BaseAdapter):
+    """Adaptateur requests qui transmet les requêtes au TestClient de l'API"""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def send(self, request, **kwargs):
+        response = self.client.request(request.method, request.url, headers=dict(request.headers), content=request.body)
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers.update(response.headers)
+        result._content = response.content
+        result.url = request.url
+        result.request = request
+        return result
+
+    def close(self):
+        pass
+
+
+def _create(client):
+    user = client.post("/users/", json={"email": "etag@example.com", "nom": "Etag", "prenom": "Test"}).json()
+    client.post(f"/users/{user['id']}/items/", json={"title": "Radio", "price": 3000})
+    return user["id"]
+
+
+def test_list_returns_304_when_unchanged(client):
+    _create(client)
+    first = client.get("/items/")
+    etag = first.headers["etag"]
+
+    second = client.get("/items/", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_etag_changes_after_write(client):
+    user_id = _create(client)
+    etag = client.get(f"/users/{user_id}").headers["etag"]
+
+    client.post(f"/users/{user_id}/items/", json={"title": "Lampe", "price": 1000})
+
+    response = client.get(f"/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["items"]) == 2
+
+
+def test_errors_and_streams_have_no_etag(client):
+    assert "etag" not in client.get("/users/999").headers
+    assert "etag" not in client.get("/export/items.ndjson").headers
+
+
+def test_etag_matches():
+    assert etag_matches('W/"a", W/"b"', 'W/"b"')
+    assert etag_matches('"b"', 'W/"b"')
+    assert etag_matches("*", 'W/"b"')
+    assert not etag_matches('W/"a"', 'W/"b"')
+
+
+def test_gui_client_reuses_data_on_304(client):
+    _create(client)
+    api = FastAPIClient("http://testserver")
+    api.session.mount("http://testserver", ASGIAdapter(client))
+
+    items = api.get_items()
+    assert api.last_not_modified is False
+    assert api.get_items() == items
+    assert api.last_not_modified is True
+
+    client.post("/users/1/items/", json={"title": "Table", "price": 5000})
+    assert len(api.get_items()) == 2
+    assert api.last_not_modified is False
+
+
+def test_gui_client_etag_cache_is_bounded(client, monkeypatch):
+    """Les réponses par article (GET /items/{id}) ne s'accumulent pas sans limite"""
+    _create(client)
+    for i in range(4):
+        client.post("/users/1/items/", json={"title": f"Article {i}", "price": i})
+    monkeypatch.setattr(FastAPIClient, "ETAG_CACHE_SIZE", 3)
+    api = FastAPIClient("http://testserver")
+    api.session.mount("http://testserver", ASGIAdapter(client))
+
+    api.get_items()
+    for item_id in range(1, 6):
+        api.get_item(item_id)
+    assert len(api._etag_cache) == 3
+
+    # La liste, la moins récemment utilisée, a été oubliée ; le dernier article est gardé
+    api.get_items()
+    assert api.last_not_modified is False
+    api.get_item(5)
+    assert api.last_not_modified is True
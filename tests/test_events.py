@@ -0,0 +1,143 @@
+"""
+Tests de la diffusion des changements (Server-Sent Events)
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from business.services import events
+from business.validation import schemas
+from database.repository import crud
+from presentation.gui.api_client import FastAPIClient
+
+
+def _create_user(db, index=1):
+    return crud.create_user(db, schemas.UserCreate(email=f"sse{index}@example.com", nom="Sse", prenom=str(index)))
+
+
+def test_changes_are_pushed_to_subscribers(session_factory, db, monkeypatch):
+    async def scenario():
+        broadcaster = events.ChangeBroadcaster(session_factory, poll_interval=10)
+        monkeypatch.setattr(events, "broadcaster", broadcaster)
+        subscriber = await broadcaster.subscribe()
+
+        # Le commit réveille le diffuseur sans attendre l'intervalle de 10 s
+        user = _create_user(db)
+        name, data = await asyncio.wait_for(subscriber.queue.get(), 2)
+
+        assert name == "change"
+        assert data == {"id": data["id"], "table": "users", "op": "insert", "row_id": user.id}
+        broadcaster.unsubscribe(subscriber)
+
+    asyncio.run(scenario())
+
+
+def test_last_event_id_replays_missed_changes(session_factory, db):
+    for index in range(3):
+        _create_user(db, index)
+
+    async def scenario():
+        broadcaster = events.ChangeBroadcaster(session_factory, poll_interval=10)
+        subscriber = await broadcaster.subscribe(last_event_id=1)
+        replayed = [subscriber.queue.get_nowait()[1]["id"] for _ in range(subscriber.queue.qsize())]
+        broadcaster.unsubscribe(subscriber)
+        return replayed
+
+    assert asyncio.run(scenario()) == [2, 3]
+
+
+def test_slow_subscriber_gets_resync():
+    async def scenario():
+        subscriber = events.Subscriber(queue_size=3, last_id=0)
+        for change_id in range(1, 6):
+            subscriber.push({"id": change_id, "table": "items", "op": "update", "row_id": change_id})
+        return [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())], subscriber.dropped
+
+    queued, dropped = asyncio.run(scenario())
+    # Le 4e événement déborde : la file est remplacée par un resync, le 5e suit
+    assert [name for name, _ in queued] == ["resync", "change"]
+    assert queued[0][1] == {"last_id": 4}
+    assert dropped == 4
+
+
+def test_stream_format_and_unsubscribe(session_factory):
+    async def scenario():
+        broadcaster = events.ChangeBroadcaster(session_factory, poll_interval=10)
+        subscriber = await broadcaster.subscribe()
+        stream = broadcaster.stream(subscriber)
+        ready = await stream.__anext__()
+        subscriber.push({"id": 7, "table": "items", "op": "delete", "row_id": 3})
+        change = await stream.__anext__()
+        await stream.aclose()
+        return ready, change, broadcaster.subscribers
+
+    ready, change, subscribers = asyncio.run(scenario())
+    assert ready == 'event: ready\ndata: {"last_id":0}\n\n'
+    assert change == 'id: 7\nevent: change\ndata: {"id":7,"table":"items","op":"delete","row_id":3}\n\n'
+    assert subscribers == set()
+
+
+def test_client_parses_event_stream():
+    lines = [
+        "event: ready", 'data: {"last_id":0}', "",
+        ": ping", "",
+        "id: 7", "event: change", 'data: {"id":7,"table":"items","op":"delete","row_id":3}', "",
+    ]
+    assert list(FastAPIClient.parse_event_stream(lines)) == [
+        ("ready", {"last_id": 0}),
+        ("change", {"id": 7, "table": "items", "op": "delete", "row_id": 3}),
+    ]
+
+
+def test_client_stream_can_be_interrupted():
+    """close_stream débloque depuis un autre thread une lecture en attente du prochain message"""
+    release = threading.Event()
+
+    class SilentStream(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # Envoi par morceaux (chunked), comme uvicorn
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            event = b'event: ready\ndata: {"last_id": 0}\n\n'
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.flush()
+            release.wait(10)  # aucun message avant longtemps
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SilentStream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = FastAPIClient(f"http://127.0.0.1:{server.server_address[1]}")
+    responses, received = [], []
+
+    def listen():
+        try:
+            for event in client.iter_events(on_connect=responses.append):
+                received.append(event)
+        except Exception:
+            pass
+
+    listener = threading.Thread(target=listen)
+    listener.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        start = time.monotonic()
+        FastAPIClient.close_stream(responses[0])
+        listener.join(5)
+
+        assert not listener.is_alive()
+        assert time.monotonic() - start < 1
+        assert received == [("ready", {"last_id": 0})]
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,39 @@
+"""
+Tests des exports NDJSON en flux
+"""
+
+import json
+
+from business.services.export import to_ndjson
+from business.validation import schemas
+from database.repository import crud
+
+
+def test_export_items(client, db):
+    user = crud.create_user(db, schemas.UserCreate(email="export@example.com", nom="Export", prenom="Test"))
+    rows = [{"title": f"Article {i}", "description": "é" if i % 2 else None, "price": i} for i in range(25)]
+    crud.create_user_items_bulk(db, [schemas.ItemCreate(**row) for row in rows], user.id)
+
+    response = client.get("/export/items.ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == list(range(1, 26))
+    assert lines[1]["description"] == "é"
+    # Même format que les réponses JSON de l'API
+    assert schemas.Item.model_validate(lines[0]).owner_id == user.id
+
+
+def test_export_users(client, db):
+    crud.create_user(db, schemas.UserCreate(email="export@example.com", nom="Export", prenom="Test"))
+
+    lines = client.get("/export/users.ndjson").text.splitlines()
+
+    assert len(lines) == 1
+    assert json.loads(lines[0])["email"] == "export@example.com"
+
+
+def test_ndjson_chunks():
+    chunks = list(to_ndjson(({"id": i} for i in range(5)), chunk_size=2))
+    assert chunks == [b'{"id": 0}\n{"id": 1}\n', b'{"id": 2}\n{"id": 3}\n', b'{"id": 4}\n']
@@ -0,0 +1,148 @@
+"""
+Tests des filtres et tris de GET /items/ et des index composites qui les servent
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, inspect, text
+
+from business.validation import schemas
+from database.models import models
+from database.repository import crud
+
+
+def _seed(db):
+    """Deux utilisateurs ; articles créés dans la même seconde (dates égales)"""
+    alice = crud.create_user(db, schemas.UserCreate(email="alice@example.com", nom="A", prenom="Alice"))
+    bob = crud.create_user(db, schemas.UserCreate(email="bob@example.com", nom="B", prenom="Bob"))
+    prices = [500, 1500, 1500, 2500, 900, 3000]
+    crud.create_user_items_bulk(db, [
+        schemas.ItemCreate(title=f"Article {chr(70 - i)}", price=price, is_available=i % 3 != 0)
+        for i, price in enumerate(prices)
+    ], alice.id)
+    crud.create_user_items_bulk(db, [schemas.ItemCreate(title="Zèbre", price=1200)], bob.id)
+    return alice.id, bob.id
+
+
+def _ids(response):
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()]
+
+
+def test_availability_and_price_range(client, db):
+    _seed(db)
+
+    response = client.get("/items/", params={"is_available": True, "min_price": 900, "max_price": 2500})
+
+    assert _ids(response) == [2, 3, 5, 7]
+    assert all(item["is_available"] and 900 <= item["price"] <= 2500 for item in response.json())
+
+
+def test_owner_and_created_range(client, db):
+    alice_id, bob_id = _seed(db)
+    dates = [datetime.fromisoformat(item["created_at"]) for item in client.get("/items/").json()]
+    first, last = min(dates), max(dates)
+
+    assert _ids(client.get("/items/", params={"owner_id": bob_id})) == [7]
+    # Bornes exclues, à la seconde près (dates SQLite stockées sans microsecondes)
+    assert _ids(client.get("/items/", params={"created_after": last.isoformat()})) == []
+    assert _ids(client.get("/items/", params={"created_before": first.isoformat()})) == []
+    before = (last + timedelta(seconds=1)).isoformat()
+    assert len(_ids(client.get("/items/", params={"owner_id": alice_id, "created_before": before}))) == 6
+    after = (first - timedelta(seconds=1)).isoformat()
+    assert len(_ids(client.get("/items/", params={"created_after": after, "created_before": before}))) == 7
+
+
+def test_sort_keys(client, db):
+    _seed(db)
+
+    assert _ids(client.get("/items/", params={"sort": "price"})) == [1, 5, 7, 2, 3, 4, 6]
+    # Égalités départagées par l'ID, dans le sens du tri
+    assert _ids(client.get("/items/", params={"sort": "-price"})) == [6, 4, 3, 2, 7, 5, 1]
+    assert _ids(client.get("/items/", params={"sort": "title", "limit": 2})) == [6, 5]
+    assert _ids(client.get("/items/", params={"sort": "-price", "skip": 2, "limit": 2})) == [3, 2]
+
+
+@pytest.mark.parametrize("sort", ["price", "-price", "created_at", "-created_at", "title", "-id"])
+def test_keyset_pages_follow_sort(client, db, sort):
+    """Les pages par curseur enchaînent sans doublon ni trou, y compris sur des dates égales"""
+    _seed(db)
+    expected = _ids(client.get("/items/", params={"sort": sort}))
+
+    ids, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/items/", params={"sort": sort, "cursor": cursor, "limit": 2}).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+
+    assert ids == expected
+
+
+def test_filters_with_cursor_and_fields(client, db):
+    _seed(db)
+    params = {"is_available": True, "sort": "-price", "fields": "title", "limit": 2}
+
+    page = client.get("/items/", params={**params, "cursor": ""}).json()
+    rest = client.get("/items/", params={**params, "cursor": page["next_cursor"]}).json()
+
+    assert page["items"] == [{"id": 6, "title": "Article A"}, {"id": 3, "title": "Article D"}]
+    assert [item["id"] for item in rest["items"]] == [2, 7]
+
+
+@pytest.mark.parametrize("params", [
+    {"sort": "description"},
+    {"sort": "price", "cursor": "eyJpZCI6M30"},  # curseur de tri par ID : {"id": 3}
+    {"sort": "price", "cursor": "eyJpZCI6Mywia2V5IjoiYWJjIn0"},  # clé non entière
+    {"sort": "price", "cursor": "eyJpZCI6MSwia2V5Ijp0cnVlfQ"},  # {"id": 1, "key": true}
+    {"sort": "created_at", "cursor": "eyJpZCI6MSwia2V5IjpbMV19"},  # {"id": 1, "key": [1]}
+    {"sort": "created_at", "cursor": "eyJpZCI6MSwia2V5Ijo1fQ"},  # {"id": 1, "key": 5}
+    {"sort": "created_at", "cursor": "eyJpZCI6MSwia2V5IjoicGFzIHVuZSBkYXRlIn0"},  # date illisible
+    {"cursor": "eyJpZCI6dHJ1ZX0"},  # {"id": true}
+    {"min_price": "bon marché"},
+])
+def test_invalid_parameters(client, db, params):
+    _seed(db)
+
+    response = client.get("/items/", params=params)
+
+    assert response.status_code in (400, 422), response.text
+
+
+def _query_plan(engine, db, **kwargs):
+    """Plan SQLite de la requête émise par crud.get_item_rows"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        crud.get_item_rows(db, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    statement, parameters = captured[-1]
+    with engine.connect() as conn:
+        return " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+
+
+def test_filters_use_composite_indexes(engine, db):
+    _seed(db)
+
+    plan = _query_plan(engine, db, fields=("price",), sort="price",
+                       filters=schemas.ItemFilters(is_available=True, min_price=900, max_price=2500))
+    assert "ix_items_is_available_price" in plan
+    assert "TEMP B-TREE" not in plan
+
+    plan = _query_plan(engine, db, fields=("created_at",), sort="created_at",
+                       filters=schemas.ItemFilters(owner_id=1, created_after=datetime(2000, 1, 1)))
+    assert "COVERING INDEX ix_items_owner_id_created_at" in plan
+
+
+def test_missing_indexes_are_created_on_existing_tables(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_items_is_available_price"))
+
+    models.create_missing_indexes(engine)
+
+    assert "ix_items_is_available_price" in {index["name"] for index in inspect(engine).get_indexes("items")}
@@ -0,0 +1,140 @@
+"""
+Tests de l'import d'articles en flux (NDJSON / CSV)
+"""
+
+import io
+import json
+
+import pytest
+
+from business.services import importer
+from business.validation import schemas
+from database.repository import crud
+
+
+def _owner(db):
+    return crud.create_user(db, schemas.UserCreate(email="import@example.com", nom="Import", prenom="Test"))
+
+
+def test_import_ndjson_upload(client, db):
+    owner = _owner(db)
+    lines = [json.dumps({"title": f"Article {i}", "price": i, "owner_id": owner.id}) for i in range(5)]
+    lines.insert(2, "{pas du json")
+    lines.append(json.dumps({"title": "Propriétaire inconnu", "price": 1, "owner_id": 999}))
+    lines.append(json.dumps({"title": "Sans prix", "owner_id": owner.id}))
+    content = "\n".join(lines).encode()
+
+    response = client.post(
+        "/import/items",
+        params={"batch_size": 2},
+        files={"file": ("articles.ndjson", content, "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["rows_read"] == 8
+    assert report["created"] == 5
+    assert [error["index"] for error in report["errors"]] == [3, 7, 8]
+    assert len(crud.get_items(db)) == 5
+
+
+def test_import_csv_with_default_owner(client, db):
+    owner = _owner(db)
+    content = "title,description,price,is_available\nClavier,,8500,false\nSouris,Sans fil,2500,true\n"
+
+    response = client.post(
+        "/import/items",
+        params={"owner_id": owner.id},
+        files={"file": ("articles.csv", content.encode(), "text/csv")},
+    )
+
+    assert response.json()["created"] == 2
+    items = crud.get_items(db)
+    assert [(item.title, item.description, item.is_available, item.owner_id) for item in items] == [
+        ("Clavier", None, False, owner.id),
+        ("Souris", "Sans fil", True, owner.id),
+    ]
+
+
+def test_import_unsupported_format(client):
+    response = client.post("/import/items", files={"file": ("articles.xlsx", b"", "application/octet-stream")})
+    assert response.status_code == 400
+
+
+def test_export_can_be_reimported(client, db):
+    owner = _owner(db)
+    crud.create_user_items_bulk(db, [schemas.ItemCreate(title="Lampe", price=1200)], owner.id)
+    exported = client.get("/export/items.ndjson").content
+
+    report = importer.import_items(db, importer.read_records(io.BytesIO(exported), "items.ndjson"))
+
+    assert report.created == 1
+    assert [item.title for item in crud.get_items(db)] == ["Lampe", "Lampe"]
+
+
+def test_one_commit_per_batch(db):
+    owner = _owner(db)
+    records = ((i, {"title": f"A{i}", "price": i, "owner_id": owner.id}, None) for i in range(1, 11))
+    progress = []
+
+    report = importer.import_items(db, records, batch_size=4, on_batch=lambda r: progress.append(r["created"]))
+
+    assert progress == [4, 8, 10]
+    assert report.created == 10
+
+
+def test_non_utf8_lines_are_reported(client, db):
+    """Les lignes mal encodées (ici Latin-1) sont des erreurs de ligne, pas une erreur 500"""
+    owner = _owner(db)
+    lines = [json.dumps({"title": title, "price": 1, "owner_id": owner.id}, ensure_ascii=False).encode(encoding)
+             for title, encoding in [("Crème", "utf-8"), ("Pâte", "latin-1"), ("Thé", "utf-8")]]
+
+    response = client.post("/import/items", params={"batch_size": 1},
+                           files={"file": ("articles.ndjson", b"\n".join(lines), "application/x-ndjson")})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 2
+    assert report["errors"] == [{"index": 2, "detail": importer.INVALID_ENCODING}]
+    assert [item.title for item in crud.get_items(db)] == ["Crème", "Thé"]
+
+
+def test_csv_malformed_rows_are_reported(client, db):
+    owner = _owner(db)
+    content = ("title,price\nClavier,8500\nSouris,2500,en trop\n".encode()
+               + "Écran,9900\n".encode("latin-1") + b"Lampe,1200\n")
+
+    report = client.post("/import/items", params={"owner_id": owner.id},
+                         files={"file": ("articles.csv", content, "text/csv")}).json()
+
+    assert report["created"] == 2
+    assert [error["index"] for error in report["errors"]] == [3, 4]
+    assert "en-tête" in report["errors"][0]["detail"]
+    assert report["errors"][1]["detail"] == importer.INVALID_ENCODING
+
+
+def test_unreadable_file_reports_committed_rows(db):
+    owner = _owner(db)
+
+    def records():
+        for i in range(1, 4):
+            yield i, {"title": f"A{i}", "price": i, "owner_id": owner.id}, None
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    with pytest.raises(importer.ImportFileError) as error:
+        importer.import_items(db, records(), batch_size=2)
+
+    assert "2 article(s) déjà importé(s)" in str(error.value)
+    assert error.value.report["created"] == len(crud.get_items(db)) == 2
+
+
+def test_csv_error_skips_only_the_record():
+    limit = importer.csv.field_size_limit(20)
+    try:
+        content = b"title,price\nA,1\n" + b"B" * 50 + b",2\nC,3\n"
+        records = list(importer.read_records(io.BytesIO(content), "articles.csv"))
+    finally:
+        importer.csv.field_size_limit(limit)
+
+    assert [(line, error is None) for line, _, error in records] == [(2, True), (3, False), (4, True)]
+    assert records[1][2].startswith("CSV invalide")
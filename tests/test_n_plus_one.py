@@ -0,0 +1,179 @@
+"""
+Tests de non-régression N+1 sur les endpoints utilisateurs
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from business.validation import schemas
+from database.config.database import configure_sqlite
+from database.repository import crud
+from infrastructure.diagnostics.query_counter import assert_max_queries, count_queries
+
+
+def _seed(db, users=5, items_per_user=3):
+    """Crée quelques utilisateurs possédant chacun des articles"""
+    for i in range(users):
+        user = crud.create_user(db, schemas.UserCreate(email=f"user{i}@example.com", nom="Nom", prenom=f"P{i}"))
+        for j in range(items_per_user):
+            crud.create_user_item(db, schemas.ItemCreate(title=f"Article {i}-{j}", price=100 * j), user.id)
+
+
+def test_read_users_constant_queries(client, engine, db):
+    """GET /users/ ne doit pas émettre un SELECT par utilisateur"""
+    _seed(db)
+
+    with assert_max_queries(engine, 2):
+        response = client.get("/users/")
+
+    assert response.status_code == 200
+    users = response.json()
+    assert len(users) == 5
+    assert all(len(user["items"]) == 3 for user in users)
+
+
+def test_read_user_single_query(client, engine, db):
+    """GET /users/{id} charge l'utilisateur et ses articles en une requête"""
+    _seed(db, users=1)
+
+    with assert_max_queries(engine, 1):
+        response = client.get("/users/1")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+
+def test_lazy_loading_is_n_plus_one(db, engine):
+    """Le mode "lazy" reste disponible et produit bien N+1 requêtes"""
+    _seed(db, users=4)
+    db.expire_all()
+
+    with count_queries(engine) as counter:
+        users = crud.get_users(db, items_loading="lazy")
+        for user in users:
+            len(user.items)
+
+    assert counter.count == 1 + len(users)
+
+
+def test_unknown_loading_strategy(db):
+    with pytest.raises(ValueError):
+        crud.get_users(db, items_loading="eager")
+
+
+def test_assert_max_queries_reports_statements(db, engine):
+    with pytest.raises(AssertionError, match="maximum autorisé : 0"):
+        with assert_max_queries(engine, 0):
+            crud.get_users(db)
+
+
+def test_users_summary_single_aggregate_query(client, engine, db):
+    """GET /users/summary compte les articles en une requête, sans les charger"""
+    _seed(db, users=3, items_per_user=2)
+    crud.create_user(db, schemas.UserCreate(email="sans.article@example.com", nom="Nom", prenom="Vide"))
+
+    with assert_max_queries(engine, 1) as counter:
+        response = client.get("/users/summary")
+
+    assert response.status_code == 200
+    assert "GROUP BY" in counter.statements[0]
+    users = response.json()
+    assert [user["items_count"] for user in users] == [2, 2, 2, 0]
+    assert all("items" not in user for user in users)
+
+
+def test_user_summary(client, db):
+    _seed(db, users=1, items_per_user=4)
+
+    response = client.get("/users/1/summary")
+    assert response.status_code == 200
+    assert response.json()["items_count"] == 4
+
+    assert client.get("/users/99/summary").status_code == 404
+
+
+def test_delete_user_constant_queries(client, engine, db):
+    """DELETE /users/{id} ne charge pas les articles et ne les supprime pas un par un"""
+    _seed(db, users=2, items_per_user=1)
+    crud.create_user_items_bulk(db, [schemas.ItemCreate(title=f"A{i}", price=i) for i in range(50)], 2)
+
+    counts = []
+    for user_id, items_count in ((1, 1), (2, 51)):
+        with count_queries(engine) as counter:
+            response = client.delete(f"/users/{user_id}")
+        assert response.json()["articles_supprimés"] == items_count
+        counts.append(counter.count)
+
+    # DELETE articles, DELETE utilisateur, version, journal (utilisateur, articles)
+    assert counts == [5, 5]
+    assert crud.get_items(db) == []
+    assert client.delete("/users/1").status_code == 404
+
+
+def test_items_cascade_in_database(engine, db):
+    """La contrainte ON DELETE CASCADE supprime les articles sans passer par le repository"""
+    _seed(db, users=1)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM users")
+    assert crud.get_items(db) == []
+
+
+def test_updates_use_update_returning(client, engine, db):
+    """PUT ne relit pas la ligne avant et après l'UPDATE"""
+    _seed(db, users=1)
+
+    with count_queries(engine) as counter:
+        item = client.put("/items/1", json={"price": 999}).json()
+    # UPDATE ... RETURNING, version, journal
+    assert counter.count == 3
+    assert counter.statements[0].startswith("UPDATE items SET")
+    assert item["price"] == 999 and item["updated_at"] is not None
+
+    with count_queries(engine) as counter:
+        user = client.put("/users/1", json={"nom": "Modifié"}).json()
+    # UPDATE ... RETURNING, version, journal, articles de la réponse
+    assert counter.count == 4
+    assert user["nom"] == "Modifié" and len(user["items"]) == 3
+
+    assert client.put("/items/999", json={"price": 1}).status_code == 404
+    assert client.put("/users/999", json={"nom": "X"}).status_code == 404
+    assert client.put("/items/1", json={}).json()["price"] == 999
+
+
+def test_create_item_single_insert(client, engine, db):
+    """POST /users/{id}/items/ ne relit pas l'utilisateur : la clé étrangère le vérifie"""
+    _seed(db, users=1, items_per_user=0)
+
+    with count_queries(engine) as counter:
+        item = client.post("/users/1/items/", json={"title": "Lampe", "price": 1000}).json()
+    # INSERT ... RETURNING, version, journal
+    assert counter.count == 3
+    assert counter.statements[0].startswith("INSERT INTO items")
+    assert item["owner_id"] == 1 and item["created_at"] is not None
+
+    response = client.post("/users/999/items/", json={"title": "Lampe", "price": 1000})
+    assert response.status_code == 404
+    assert response.json()["detail"].startswith("Utilisateur non trouvé")
+    assert client.post("/users/999/items/bulk", json=[{"title": "A", "price": 1}]).status_code == 404
+    assert len(crud.get_items(db)) == 1
+
+
+def test_foreign_keys_enforced_with_default_profile():
+    engine = configure_sqlite(create_engine("sqlite://"), "default")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+
+def test_delete_item_single_delete(client, engine, db):
+    """DELETE /items/{id} ne relit pas l'article : le propriétaire vient du DELETE ... RETURNING"""
+    _seed(db, users=1, items_per_user=2)
+
+    with count_queries(engine) as counter:
+        response = client.delete("/items/1")
+
+    assert response.status_code == 200
+    # DELETE article, version, journal
+    assert counter.count == 3, counter.statements
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in counter.statements)
+    assert client.delete("/items/1").status_code == 404
+    assert [item.id for item in crud.get_items(db)] == [2]
@@ -0,0 +1,64 @@
+"""
+Tests de la pagination par curseur (keyset pagination)
+"""
+
+import pytest
+
+from business.services.pagination import decode_cursor, encode_cursor
+from business.validation import schemas
+from database.repository import crud
+
+
+def _seed_items(db, count):
+    user = crud.create_user(db, schemas.UserCreate(email="pagination@example.com", nom="Page", prenom="Test"))
+    for i in range(count):
+        crud.create_user_item(db, schemas.ItemCreate(title=f"Article {i}", price=i), user.id)
+    return user
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor("") == 0
+
+
+@pytest.mark.parametrize("cursor", ["pas-un-curseur", encode_cursor(1)[:-2] + "!!"])
+def test_invalid_cursor(client, cursor):
+    response = client.get("/items/", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_items_cursor_walks_all_pages(client, db):
+    _seed_items(db, 7)
+
+    seen = []
+    cursor = ""
+    pages = 0
+    while cursor is not None:
+        response = client.get("/items/", params={"cursor": cursor, "limit": 3})
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        pages += 1
+
+    assert seen == list(range(1, 8))
+    assert pages == 3
+
+
+def test_user_items_and_users_cursor(client, db):
+    user = _seed_items(db, 4)
+
+    page = client.get(f"/users/{user.id}/items/", params={"cursor": "", "limit": 4}).json()
+    assert len(page["items"]) == 4
+    assert page["next_cursor"] is None
+
+    page = client.get("/users/", params={"cursor": ""}).json()
+    assert [u["id"] for u in page["items"]] == [user.id]
+    assert len(page["items"][0]["items"]) == 4
+
+
+def test_skip_limit_still_returns_list(client, db):
+    _seed_items(db, 5)
+
+    response = client.get("/items/", params={"skip": 2, "limit": 2})
+    assert [item["id"] for item in response.json()] == [3, 4]
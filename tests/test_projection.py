@@ -0,0 +1,129 @@
+"""
+Tests de la projection des réponses de lecture (`?fields=`)
+"""
+
+import pytest
+
+from business.services import projection
+from business.validation import schemas
+from database.repository import crud
+from infrastructure.diagnostics.query_counter import count_queries
+from presentation.gui.api_client import FastAPIClient
+from tests.test_etag import ASGIAdapter
+
+
+def _seed(db, users=2, items_per_user=3):
+    for i in range(users):
+        user = crud.create_user(db, schemas.UserCreate(email=f"proj{i}@example.com", nom="Nom", prenom=f"P{i}"))
+        crud.create_user_items_bulk(
+            db, [schemas.ItemCreate(title=f"Article {i}-{j}", description="Longue description", price=j)
+                 for j in range(items_per_user)],
+            user.id,
+        )
+
+
+def test_items_list_projection(client, db, engine):
+    """Seules les colonnes demandées sont lues et renvoyées (l'ID toujours)"""
+    _seed(db)
+
+    with count_queries(engine) as counter:
+        response = client.get("/items/?fields=title,price")
+
+    assert response.status_code == 200
+    assert response.json()[0] == {"id": 1, "title": "Article 0-0", "price": 0}
+    select_sql = counter.statements[0]
+    assert "description" not in select_sql and "created_at" not in select_sql
+
+
+def test_items_cursor_projection(client, db):
+    _seed(db)
+
+    page = client.get("/items/?cursor=&limit=4&fields=title").json()
+    assert [set(item) for item in page["items"]] == [{"id", "title"}] * 4
+    rest = client.get(f"/items/?cursor={page['next_cursor']}&limit=4&fields=title").json()
+    assert [item["id"] for item in rest["items"]] == [5, 6]
+
+
+def test_user_items_projection(client, db):
+    _seed(db)
+
+    items = client.get("/users/2/items/?fields=title").json()
+
+    assert items == [{"id": 4, "title": "Article 1-0"}, {"id": 5, "title": "Article 1-1"},
+                     {"id": 6, "title": "Article 1-2"}]
+    assert client.get("/users/99/items/?fields=title").status_code == 404
+
+
+def test_users_without_items(client, db, engine):
+    """Sans `items` dans fields, les articles ne sont pas chargés"""
+    _seed(db)
+
+    with count_queries(engine) as counter:
+        users = client.get("/users/?fields=email").json()
+
+    assert users == [{"id": 1, "email": "proj0@example.com"}, {"id": 2, "email": "proj1@example.com"}]
+    assert counter.count == 1
+
+
+def test_users_nested_item_fields(client, db):
+    _seed(db, users=1, items_per_user=2)
+
+    users = client.get("/users/?fields=nom,items.title").json()
+
+    assert users == [{"id": 1, "nom": "Nom", "items": [{"id": 1, "title": "Article 0-0"},
+                                                       {"id": 2, "title": "Article 0-1"}]}]
+    full_items = client.get("/users/?fields=nom,items").json()[0]["items"]
+    assert set(full_items[0]) == set(projection.ITEM_FIELDS)
+
+
+def test_detail_projection_uses_load_only(client, db, engine):
+    _seed(db, users=1)
+
+    with count_queries(engine) as counter:
+        item = client.get("/items/2?fields=price").json()
+    user = client.get("/users/1?fields=email,items.price").json()
+
+    assert item == {"id": 2, "price": 1}
+    assert "description" not in counter.statements[0]
+    assert user == {"id": 1, "email": "proj0@example.com",
+                    "items": [{"id": 1, "price": 0}, {"id": 2, "price": 1}, {"id": 3, "price": 2}]}
+
+
+def test_detail_projection_from_cache(client, db, engine):
+    """Une entrée en cache (réponse complète) est réduite sans requête SQL"""
+    _seed(db, users=1)
+    client.get("/items/1")
+
+    with count_queries(engine) as counter:
+        item = client.get("/items/1?fields=title").json()
+
+    assert item == {"id": 1, "title": "Article 0-0"}
+    assert counter.count == 0
+    assert client.get("/items/99?fields=title").status_code == 404
+
+
+@pytest.mark.parametrize("url", ["/items/?fields=prix", "/users/?fields=items.prix", "/items/1?fields=id,secret"])
+def test_unknown_field(client, db, url):
+    _seed(db, users=1)
+
+    response = client.get(url)
+
+    assert response.status_code == 400
+    assert "Champ(s) inconnu(s)" in response.json()["detail"]
+
+
+def test_parse_fields_order_and_id():
+    assert projection.parse_item_fields(" price , title,") == ("title", "price", "id")
+    assert projection.parse_item_fields(None) is None
+    assert projection.parse_user_fields(None) == (None, projection.ITEM_FIELDS)
+    assert projection.parse_user_fields("email") == (("email", "id"), None)
+
+
+def test_gui_client_requests_table_fields(client, db):
+    _seed(db, users=1, items_per_user=1)
+    api = FastAPIClient("http://testserver")
+    api.session.mount("http://testserver", ASGIAdapter(client))
+
+    fields = "title,description,price,is_available,owner_id"
+    assert set(api.get_items(fields=fields)[0]) == {"id", *fields.split(",")}
+    assert api.get_item(1, fields="price") == {"id": 1, "price": 0}
@@ -0,0 +1,61 @@
+"""
+Tests de la recherche d'articles (index plein texte FTS5)
+"""
+
+from sqlalchemy import text
+
+from business.validation import schemas
+from database.repository import crud, search_index
+
+
+def _seed(db):
+    user = crud.create_user(db, schemas.UserCreate(email="search@example.com", nom="Search", prenom="Test"))
+    crud.create_user_item(db, schemas.ItemCreate(title="Vélo électrique VTT", description="Batterie 500Wh", price=1), user.id)
+    crud.create_user_item(db, schemas.ItemCreate(title="Casque", description="Pour vélo de route", price=2), user.id)
+    crud.create_user_item(db, schemas.ItemCreate(title="Console PlayStation 5", description=None, price=3), user.id)
+    return user
+
+
+def test_prefix_search_ranks_title_first(client, db):
+    _seed(db)
+
+    response = client.get("/search/items", params={"q": "velo"})
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()] == ["Vélo électrique VTT", "Casque"]
+
+    titles = [item["title"] for item in client.get("/search/items", params={"q": "play"}).json()]
+    assert titles == ["Console PlayStation 5"]
+
+
+def test_all_words_must_match(client, db):
+    _seed(db)
+
+    titles = [item["title"] for item in client.get("/search/items", params={"q": "velo route"}).json()]
+    assert titles == ["Casque"]
+
+
+def test_index_follows_updates_and_deletes(client, db):
+    _seed(db)
+
+    client.put("/items/3", json={"title": "Manette sans fil"})
+    client.delete("/items/2")
+
+    assert client.get("/search/items", params={"q": "console"}).json() == []
+    assert [i["id"] for i in client.get("/search/items", params={"q": "manette"}).json()] == [3]
+    assert [i["id"] for i in client.get("/search/items", params={"q": "route"}).json()] == []
+
+
+def test_rebuild(engine, db):
+    _seed(db)
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {search_index.FTS_TABLE}({search_index.FTS_TABLE}) VALUES ('delete-all')"))
+    assert crud.search_items(db, "casque") == []
+
+    assert search_index.rebuild_search_index(engine) == 3
+    assert [item.title for item in crud.search_items(db, "casque")] == ["Casque"]
+
+
+def test_fallback_without_words(db):
+    _seed(db)
+    assert search_index.build_match_query("++") is None
+    assert crud.search_items(db, "++") == []
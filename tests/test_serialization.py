@@ -0,0 +1,83 @@
+"""
+Tests de la sérialisation des listes à partir des lignes (TypeAdapter, orjson)
+"""
+
+import json
+
+import pytest
+
+from business.services import projection, serialization
+from business.validation import schemas
+from database.repository import crud
+from infrastructure.diagnostics.query_counter import assert_max_queries
+
+# Adaptateur des listes d'articles complets, celui de GET /items/
+ITEM_LIST = projection.adapters(projection.item_schema(None))[1]
+
+
+def _seed(db, users=3, items_per_user=4):
+    for i in range(users):
+        user = crud.create_user(db, schemas.UserCreate(email=f"json{i}@example.com", nom="Nom", prenom=f"P{i}"))
+        crud.create_user_items_bulk(
+            db, [schemas.ItemCreate(title=f"Article {i}-{j}", description="Desc", price=j) for j in range(items_per_user)],
+            user.id,
+        )
+
+
+def test_item_rows_match_orm_path(client, db):
+    """GET /items/ renvoie le même JSON que la validation des objets ORM"""
+    _seed(db)
+
+    expected = [schemas.Item.model_validate(item).model_dump(mode="json") for item in crud.get_items(db)]
+    response = client.get("/items/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == expected
+
+
+def test_user_rows_match_orm_path(client, db, engine):
+    """GET /users/ : articles regroupés par utilisateur en deux requêtes"""
+    _seed(db)
+
+    users = crud.get_users(db, items_loading="selectin")
+    expected = [schemas.User.model_validate(user).model_dump(mode="json") for user in users]
+    with assert_max_queries(engine, 2):
+        response = client.get("/users/?limit=2")
+
+    assert response.json() == expected[:2]
+    page = client.get("/users/?cursor=&limit=2").json()
+    assert page["items"] == expected[:2]
+    assert client.get(f"/users/?cursor={page['next_cursor']}&limit=2").json()["items"] == expected[2:]
+
+
+def test_user_without_items(client, db):
+    crud.create_user(db, schemas.UserCreate(email="vide@example.com", nom="Nom", prenom="Vide"))
+
+    assert client.get("/users/").json()[0]["items"] == []
+
+
+@pytest.mark.parametrize("encoder", serialization.JSON_ENCODERS)
+def test_encoders_produce_same_payload(db, encoder):
+    if encoder == "orjson":
+        pytest.importorskip("orjson")
+    _seed(db, users=1)
+    rows = crud.get_item_rows(db)
+
+    body = serialization.dump_json(ITEM_LIST, rows, encoder)
+
+    expected = serialization.dump_json(ITEM_LIST, rows, "pydantic")
+    assert json.loads(body) == json.loads(expected)
+
+
+def test_unknown_encoder(db):
+    with pytest.raises(ValueError):
+        serialization.dump_json(ITEM_LIST, [], "ujson")
+
+
+def test_orjson_response_class():
+    pytest.importorskip("orjson")
+    response = serialization.ORJSONResponse({"prix": 12, "titre": "Été"})
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"prix": 12, "titre": "Été"}
@@ -0,0 +1,84 @@
+"""
+Tests des statistiques agrégées (GET /stats)
+"""
+
+import pytest
+
+from business.services import cache
+from business.validation import schemas
+from database.repository import crud
+from infrastructure.diagnostics.query_counter import count_queries
+
+
+def _seed(db):
+    """Trois utilisateurs (un inactif, un sans article) et dix articles"""
+    alice = crud.create_user(db, schemas.UserCreate(email="alice@example.com", nom="A", prenom="Alice"))
+    bob = crud.create_user(db, schemas.UserCreate(email="bob@example.com", nom="B", prenom="Bob", is_active=False))
+    crud.create_user(db, schemas.UserCreate(email="claire@example.com", nom="C", prenom="Claire"))
+    crud.create_user_items_bulk(db, [
+        schemas.ItemCreate(title=f"A{price}", price=price, is_available=price != 300)
+        for price in (100, 200, 300, 400, 500, 600, 700)
+    ], alice.id)
+    crud.create_user_items_bulk(db, [
+        schemas.ItemCreate(title=f"B{price}", price=price, is_available=False) for price in (800, 900, 1000)
+    ], bob.id)
+
+
+def test_stats(client, db):
+    _seed(db)
+
+    stats = client.get("/stats").json()
+
+    assert stats == {
+        "users_count": 3,
+        "active_users": 2,
+        "items_count": 10,
+        "available_items": 6,
+        # Rang le plus proche : ceil(p * 10 / 100)
+        "prices": {"min": 100, "max": 1000, "avg": 550.0, "p50": 500, "p90": 900, "p95": 1000, "p99": 1000},
+        "owners": [
+            {"owner_id": 1, "items_count": 7, "available_items": 6},
+            {"owner_id": 2, "items_count": 3, "available_items": 0},
+        ],
+    }
+    assert client.get("/stats?owners=1").json()["owners"] == stats["owners"][:1]
+
+
+def test_stats_of_empty_database(client):
+    stats = client.get("/stats").json()
+
+    assert stats["users_count"] == stats["items_count"] == 0
+    assert stats["prices"] == {"min": None, "max": None, "avg": None,
+                               "p50": None, "p90": None, "p95": None, "p99": None}
+    assert stats["owners"] == []
+
+
+def test_stats_use_two_queries(db, engine):
+    """Deux requêtes quel que soit le nombre d'utilisateurs (pas de N+1)"""
+    _seed(db)
+    for i in range(20):
+        crud.create_user(db, schemas.UserCreate(email=f"u{i}@example.com", nom="N", prenom=str(i)))
+
+    with count_queries(engine) as counter:
+        crud.get_stats(db)
+
+    assert counter.count == 2
+
+
+def test_stats_are_cached_briefly(client, db, engine, monkeypatch):
+    _seed(db)
+    first = client.get("/stats").json()
+    crud.create_user(db, schemas.UserCreate(email="new@example.com", nom="N", prenom="New"))
+
+    with count_queries(engine) as counter:
+        assert client.get("/stats").json() == first
+    assert counter.count == 0
+
+    # À l'expiration (ici : cache vidé), les chiffres sont recalculés
+    cache.stats_cache.clear()
+    assert client.get("/stats").json()["users_count"] == 4
+
+
+@pytest.mark.parametrize("owners", ["-1", "beaucoup"])
+def test_invalid_owners_limit(client, owners):
+    assert client.get(f"/stats?owners={owners}").status_code in (400, 422)
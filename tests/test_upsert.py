@@ -0,0 +1,113 @@
+"""
+Tests de l'upsert par email (PUT /users/by-email/{email}) et de la création
+d'utilisateur sans vérification préalable de l'email
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from business.validation import schemas
+from database.config.database import configure_sqlite
+from database.models import models
+from database.repository import crud
+from infrastructure.diagnostics.query_counter import count_queries
+
+
+def test_upsert_creates_then_replaces(client, engine):
+    with count_queries(engine) as counter:
+        created = client.put("/users/by-email/up@example.com", json={"nom": "Up", "prenom": "Sert"}).json()
+    # INSERT ... ON CONFLICT ... RETURNING, version, journal
+    assert counter.count == 3
+    assert created["email"] == "up@example.com" and created["items"] == []
+    client.post(f"/users/{created['id']}/items/", json={"title": "Lampe", "price": 1000})
+
+    updated = client.put("/users/by-email/up@example.com", json={"nom": "Down", "prenom": "Sert", "is_active": False})
+
+    assert updated.status_code == 200
+    assert updated.json()["id"] == created["id"]
+    assert updated.json()["nom"] == "Down" and updated.json()["is_active"] is False
+    assert updated.json()["updated_at"] is not None
+    assert len(updated.json()["items"]) == 1
+    assert len(client.get("/users/").json()) == 1
+
+    feed = client.get("/users/changes").json()["changes"]
+    assert [change["operation"] for change in feed] == ["insert", "update"]
+
+
+def test_upsert_invalidates_cache(client):
+    user = client.put("/users/by-email/up@example.com", json={"nom": "Up", "prenom": "Sert"}).json()
+    client.get(f"/users/{user['id']}")
+    client.put("/users/by-email/up@example.com", json={"nom": "Neuf", "prenom": "Sert"})
+    assert client.get(f"/users/{user['id']}").json()["nom"] == "Neuf"
+
+
+def test_create_duplicate_email_is_400(client, engine):
+    payload = {"email": "dup@example.com", "nom": "Dup", "prenom": "Licate"}
+    with count_queries(engine) as counter:
+        assert client.post("/users/", json=payload).status_code == 200
+    # INSERT ... RETURNING, version, journal : pas de SELECT préalable sur l'email
+    assert counter.count == 3
+
+    response = client.post("/users/", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "L'email est déjà enregistré"
+
+
+def test_upsert_without_on_conflict(client, monkeypatch):
+    """Bases sans ON CONFLICT : INSERT puis UPDATE ... RETURNING si l'email existe"""
+    monkeypatch.setattr(crud, "UPSERT_INSERTS", {})
+
+    created = client.put("/users/by-email/up@example.com", json={"nom": "Up", "prenom": "Sert"})
+    updated = client.put("/users/by-email/up@example.com", json={"nom": "Down", "prenom": "Sert"})
+
+    assert created.status_code == updated.status_code == 200
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["nom"] == "Down" and updated.json()["updated_at"] is not None
+    feed = client.get("/users/changes").json()["changes"]
+    assert [change["operation"] for change in feed] == ["insert", "update"]
+
+
+def test_update_to_taken_email_is_400(client):
+    first = client.post("/users/", json={"email": "a@example.com", "nom": "A", "prenom": "A"}).json()
+    client.post("/users/", json={"email": "b@example.com", "nom": "B", "prenom": "B"})
+
+    response = client.put(f"/users/{first['id']}", json={"email": "b@example.com"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "L'email est déjà enregistré"
+    assert client.get(f"/users/{first['id']}").json()["email"] == "a@example.com"
+    # Garder son propre email n'est pas un doublon
+    assert client.put(f"/users/{first['id']}", json={"email": "a@example.com", "nom": "AA"}).status_code == 200
+
+
+@pytest.mark.parametrize("portable", [False, True])
+def test_concurrent_creates_and_upserts(tmp_path, monkeypatch, portable):
+    if portable:
+        monkeypatch.setattr(crud, "UPSERT_INSERTS", {})
+    engine = configure_sqlite(create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"check_same_thread": False}))
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def create(i):
+        with Session() as db:
+            try:
+                crud.create_user(db, schemas.UserCreate(email="race@example.com", nom="R", prenom=str(i)))
+                return "créé"
+            except ValueError:
+                return "doublon"
+
+    def upsert(i):
+        with Session() as db:
+            return crud.upsert_user_by_email(db, "upsert@example.com", schemas.UserUpsert(nom="U", prenom=str(i))).id
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        created = list(pool.map(create, range(16)))
+        upserted_ids = set(pool.map(upsert, range(16)))
+
+    assert sorted(created).count("créé") == 1 and created.count("doublon") == 15
+    assert len(upserted_ids) == 1
+    engine.dispose()
@@ -0,0 +1,50 @@
+"""
+Tests des versions de tables (GET /changes/version)
+"""
+
+from database.models import models
+from database.repository import crud
+
+
+def _versions(client):
+    return client.get("/changes/version").json()
+
+
+def test_versions_start_at_zero(client):
+    assert _versions(client) == {"users": 0, "items": 0}
+
+
+def test_writes_bump_their_tables(client):
+    user = client.post("/users/", json={"email": "v@example.com", "nom": "V", "prenom": "Test"}).json()
+    assert _versions(client) == {"users": 1, "items": 0}
+
+    item = client.post(f"/users/{user['id']}/items/", json={"title": "Lampe", "price": 1000}).json()
+    client.post(f"/users/{user['id']}/items/bulk", json=[{"title": "Table", "price": 5000}])
+    client.put(f"/items/{item['id']}", json={"price": 900})
+    assert _versions(client) == {"users": 1, "items": 3}
+
+    client.delete(f"/items/{item['id']}")
+    client.put(f"/users/{user['id']}", json={"nom": "W"})
+    client.delete(f"/users/{user['id']}")
+    assert _versions(client) == {"users": 3, "items": 5}
+
+
+def test_reads_and_failed_writes_do_not_bump(client):
+    client.get("/users/")
+    client.get("/items/")
+    client.put("/items/999", json={"price": 1})
+    client.post("/users/bulk", json=[])
+    assert _versions(client) == {"users": 0, "items": 0}
+
+
+def test_version_is_rolled_back_with_the_write(db):
+    crud._bump_versions(db, "items")
+    db.rollback()
+    assert crud.get_versions(db) == {"users": 0, "items": 0}
+
+
+def test_missing_version_rows_are_created(db):
+    db.query(models.TableVersion).delete()
+    crud._bump_versions(db, "users", "items")
+    db.commit()
+    assert crud.get_versions(db) == {"users": 1, "items": 1}